@@ -1,21 +1,63 @@
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional
-from app.services.leaderboard import redis_leaderboard
+import redis.asyncio as aioredis
+from app.core.config import settings
+from app.services.leaderboard import redis_leaderboard, leaderboard_changes_channel
 from app.core.metrics import (
     LEADERBOARD_QUERIES_TOTAL,
     LEADERBOARD_QUERY_DURATION_SECONDS,
     ENVIRONMENTS_LIST_REQUESTS_TOTAL,
     ENVIRONMENTS_LIST_FAILURES_TOTAL,
-    DurationTimer,
 )
 import logging
+from time import perf_counter
 import gymnasium as gym
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Closed set of sort modes used as a metric label; anything else is "other"
+_ALLOWED_SORTS = {"score_desc", "date_desc", "date_asc"}
+
+# Async client for the change stream; pub/sub holds one connection per open stream
+_stream_redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+# Idle streams send an SSE comment this often so proxies keep them open
+_STREAM_HEARTBEAT_SECONDS = 15.0
+
+
+@router.get("/stream")
+async def stream_leaderboard_changes(
+    request: Request,
+    env_id: str = Query("CartPole-v1", description="Gym environment ID"),
+):
+    """Server-Sent Events: emits `changed` whenever env_id's leaderboard is written."""
+    async def events():
+        pubsub = _stream_redis.pubsub()
+        try:
+            await pubsub.subscribe(leaderboard_changes_channel(env_id))
+            while not await request.is_disconnected():
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_STREAM_HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield "data: changed\n\n"
+        except Exception as e:
+            logger.debug("leaderboard_stream_closed", extra={"env_id": env_id, "error": str(e)})
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception as e:
+                logger.debug("leaderboard_stream_close_failed", extra={"error": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/environments")
 def list_environments():
     """List available Gymnasium environments. Best-effort; fallback to curated list."""
@@ -47,6 +89,8 @@ def list_environments():
 @router.get("/")
 @router.get("")
 def get_leaderboard(
+    request: Request,
+    response: Response,
     env_id: str = Query("CartPole-v1", description="Gym environment ID"),
     limit: int = Query(50, ge=1, le=500, description="Number of results to return"),
     id_query: Optional[str] = Query(None, description="Filter by submission ID contains"),
@@ -63,30 +107,44 @@ def get_leaderboard(
     Falls back to database if Redis fails
     """
     try:
-        with DurationTimer() as t:
-            # Get from Redis (primary source) with DB fallback handled inside
-            leaderboard = redis_leaderboard.get_leaderboard(
-                env_id=env_id,
-                limit=limit,
-                id_query=id_query,
-                user=user,
-                algorithm=algorithm,
-                score_min=score_min,
-                score_max=score_max,
-                date_from=date_from,
-                date_to=date_to,
-                sort=sort,
-            )
-            LEADERBOARD_QUERIES_TOTAL.labels(env_id=env_id, sort=sort).inc()
-            LEADERBOARD_QUERY_DURATION_SECONDS.observe(t.seconds)
-            logger.info(
-                "leaderboard_query",
-                extra={
-                    "env_id": env_id,
-                    "sort": sort,
-                },
-            )
-            return leaderboard
+        t0 = perf_counter()
+        sort_label = sort if sort in _ALLOWED_SORTS else "other"
+        # ETag follows the env's write counter; the query string is part of
+        # the URL, so one version per env is enough. The same version keys the
+        # service's response caches, so the body is never older than the tag
+        version = redis_leaderboard.get_version(env_id)
+        etag = f'W/"lb-{version}"' if version is not None else None
+        if etag is not None and request.headers.get("if-none-match") == etag:
+            # Revalidations are still queries: count and time them too
+            LEADERBOARD_QUERIES_TOTAL.labels(env_id=env_id, sort=sort_label).inc()
+            LEADERBOARD_QUERY_DURATION_SECONDS.observe(perf_counter() - t0)
+            return Response(status_code=304, headers={"ETag": etag})
+        # Get from Redis (primary source) with DB fallback handled inside
+        leaderboard = redis_leaderboard.get_leaderboard(
+            env_id=env_id,
+            limit=limit,
+            id_query=id_query,
+            user=user,
+            algorithm=algorithm,
+            score_min=score_min,
+            score_max=score_max,
+            date_from=date_from,
+            date_to=date_to,
+            sort=sort,
+            version=version,
+        )
+        LEADERBOARD_QUERIES_TOTAL.labels(env_id=env_id, sort=sort_label).inc()
+        LEADERBOARD_QUERY_DURATION_SECONDS.observe(perf_counter() - t0)
+        logger.info(
+            "leaderboard_query",
+            extra={
+                "env_id": env_id,
+                "sort": sort,
+            },
+        )
+        if etag is not None:
+            response.headers["ETag"] = etag
+        return leaderboard
     except Exception as e:
         logger.error(
             f"Leaderboard retrieval failed: {str(e)}",
@@ -51,23 +51,20 @@ def get_prometheus_metrics(db: Session = Depends(get_db)):
     prometheus_metrics.append(f"# HELP evaluation_duration_seconds Time spent evaluating a submission")
     prometheus_metrics.append(f"# TYPE evaluation_duration_seconds histogram")
     
-    buckets = [0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0]
-    
-    # Get REAL durations from Redis for each environment
+    # Get REAL duration histograms from Redis for each environment
     for env_id, completed, failed in env_stats:
         if completed > 0:
-            real_durations = real_metrics.get_evaluation_durations(env_id)
+            hist = real_metrics.get_evaluation_duration_histogram(env_id)
             
-            if real_durations:
+            if hist:
                 # Add histogram buckets for REAL durations
-                for bucket in buckets:
-                    count = sum(1 for d in real_durations if d <= bucket)
+                for bucket, count in hist["buckets"]:
                     prometheus_metrics.append(f'evaluation_duration_seconds_bucket{{env_id="{env_id}",le="{bucket}"}} {count}')
+                prometheus_metrics.append(f'evaluation_duration_seconds_bucket{{env_id="{env_id}",le="+Inf"}} {hist["count"]}')
                 
                 # Add sum and count
-                total_duration = sum(real_durations)
-                prometheus_metrics.append(f'evaluation_duration_seconds_sum{{env_id="{env_id}"}} {total_duration}')
-                prometheus_metrics.append(f'evaluation_duration_seconds_count{{env_id="{env_id}"}} {len(real_durations)}')
+                prometheus_metrics.append(f'evaluation_duration_seconds_sum{{env_id="{env_id}"}} {hist["sum"]}')
+                prometheus_metrics.append(f'evaluation_duration_seconds_count{{env_id="{env_id}"}} {hist["count"]}')
     
     # Get REAL validation failures from Redis
     real_failures = real_metrics.get_validation_failures()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_async_db
 from app.models import Submission
 from app.core.celery import evaluate_submission_task
 from app.core.client import supabase_client
@@ -120,7 +121,7 @@ async def submit_rl_script(
             raise HTTPException(400, "main_file is required when uploading multiple files")
         if not chosen_main.lower().endswith('.py'):
             SUBMISSIONS_VALIDATION_FAILURES_TOTAL.labels(reason="main_not_py").inc()
-r            real_metrics.record_validation_failure("main_not_py")
+            real_metrics.record_validation_failure("main_not_py")
             raise HTTPException(400, "main_file must be a Python (.py) file")
 
         # Build tar archive in-memory; include all files at root
@@ -278,8 +279,8 @@ r            real_metrics.record_validation_failure("main_not_py")
     }
 
 @router.get("/results/{submission_id}")
-def get_evaluation_results(submission_id: str, db: Session = Depends(get_db)):
-    submission = db.query(Submission).get(submission_id)
+async def get_evaluation_results(submission_id: str, db: AsyncSession = Depends(get_async_db)):
+    submission = await db.get(Submission, submission_id)
     if not submission:
         logger.warning(
             f"Submission not found: {submission_id}",
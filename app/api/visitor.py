@@ -1,6 +1,7 @@
 
-from fastapi import APIRouter, Request, Response, HTTPException
+from fastapi import APIRouter, Request, Response, HTTPException, Header
 import logging
+import secrets
 from app.core.config import settings
 import time
 import jwt
@@ -202,3 +203,12 @@ def refresh_unique_visitor_metrics() -> None:
         # do not raise; metrics are best-effort
         logger.warning("visitor_metrics_refresh_failed", extra={"error": str(e)})
 
+
+@router.post("/internal/refresh-visitor-metrics")
+def refresh_visitor_metrics_endpoint(x_internal_token: str | None = Header(default=None)):
+    # Lets cron/scripts refresh the gauges with one request instead of a docker exec
+    expected = settings.INTERNAL_TOKEN
+    if not expected or not x_internal_token or not secrets.compare_digest(x_internal_token, expected):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    refresh_unique_visitor_metrics()
+    return {"status": "ok"}
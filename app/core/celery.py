@@ -3,7 +3,7 @@ from celery.signals import task_prerun, task_postrun, task_failure, task_retry
 from app.core.config import settings
 import os
 import logging
-from app.core.metrics import start_worker_metrics_server, start_celery_queue_length_collector
+from app.core.metrics import start_worker_metrics_server, register_celery_queue_length_collector
 from app.core.logging_config import setup_logging
 
 # Ensure structured JSON logging for the worker process
@@ -49,17 +49,16 @@ def setup_observability(sender, **kwargs):
     except Exception as e:
         logger.error(f"Failed to start worker metrics server: {str(e)}")
     
-    # Queue length collector for Celery broker
+    # Queue length collector for Celery broker (evaluated on each scrape)
     try:
-        logger.info("Starting queue length collector...")
-        start_celery_queue_length_collector(
+        logger.info("Registering queue length collector...")
+        register_celery_queue_length_collector(
             os.getenv("CELERY_BROKER_URL", "redis://redis:6379/1"),
             queue_names=["celery", "heavy"],
-            interval_seconds=10,
         )
-        logger.info("Queue length collector started successfully")
+        logger.info("Queue length collector registered successfully")
     except Exception as e:
-        logger.error(f"Failed to start queue length collector: {str(e)}")
+        logger.error(f"Failed to register queue length collector: {str(e)}")
 
 
 # ---- Celery task lifecycle structured logs ----
@@ -172,4 +171,5 @@ def evaluate_submission_task(self, submission_id: str):
     try:
         return evaluate_submission(submission_id)
     except Exception as exc:
-        raise self.retry(exc=exc, countdown=60)
\ No newline at end of file
+        raise self.retry(exc=exc, countdown=60)
+
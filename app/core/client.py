@@ -1,6 +1,5 @@
 
 from supabase import create_client, Client
-import os
 from app.core.config import settings
 
 # Create Supabase client
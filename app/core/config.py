@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -7,8 +8,16 @@ class Settings(BaseSettings):
     # Use env-provided DATABASE_URL. No hardcoded credentials.
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
 
+    # Run Base.metadata.create_all on API startup. Off by default: tables are
+    # created once via scripts/init_db.py (or by enabling this for one boot).
+    RUN_CREATE_ALL: bool = os.getenv("RUN_CREATE_ALL", "false").lower() in ("1", "true", "yes")
+
     # Redis configuration
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    # Logical DB for leaderboard keys; unset means the DB in REDIS_URL
+    REDIS_LEADERBOARD_DB: Optional[int] = (
+        int(os.environ["REDIS_LEADERBOARD_DB"]) if os.getenv("REDIS_LEADERBOARD_DB") else None
+    )
 
     # Celery configuration
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/1")
@@ -36,6 +45,9 @@ class Settings(BaseSettings):
     VISITOR_JWT_AUDIENCE: str = os.getenv("VISITOR_JWT_AUDIENCE", "visitor")
     VISITOR_JWT_TTL_DAYS: int = int(os.getenv("VISITOR_JWT_TTL_DAYS", "30"))
 
+    # Shared secret for internal maintenance endpoints (disabled when empty)
+    INTERNAL_TOKEN: str = os.getenv("INTERNAL_TOKEN", "")
+
     # Public base URL used for SEO (sitemap/robots). Example: https://leaderboard.example.com
     PUBLIC_BASE_URL: str = os.getenv("PUBLIC_BASE_URL", "https://rl-eval-leaderboard.onrender.com")
 
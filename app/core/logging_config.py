@@ -2,6 +2,23 @@ import logging
 import os
 from pythonjsonlogger import jsonlogger
 
+try:
+    import orjson
+except ImportError:  # fall back to the formatter's stdlib json.dumps
+    orjson = None
+
+
+def _orjson_dumps(obj, default=None, cls=None, **_kwargs) -> str:
+    """json.dumps-compatible serializer for JsonFormatter backed by orjson.
+
+    Values orjson can't encode natively go through the formatter's default
+    hook (or its JsonEncoder, which handles datetimes/exceptions and falls
+    back to str()). Returns str because StreamHandler writes text.
+    """
+    if default is None:
+        default = cls().default if cls is not None else str
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 class ContextDefaultsFilter(logging.Filter):
     """Ensure logs always include common context keys and a service name.
@@ -74,6 +91,7 @@ def setup_logging() -> None:
             "levelname": "level",
             "asctime": "time",
         },
+        **({"json_serializer": _orjson_dumps} if orjson is not None else {}),
     )
     handler.setFormatter(formatter)
     handler.addFilter(ContextDefaultsFilter(service_name))
@@ -3,8 +3,11 @@ import time
 import logging
 from typing import Optional
 
-from prometheus_client import Counter, Histogram, Gauge, start_http_server
-from threading import Thread, Event
+from prometheus_client import Counter, Histogram, Gauge, REGISTRY, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import redis as redis_lib
 
 # Simple metrics configuration (no multiprocess)
@@ -70,6 +73,9 @@ EVALUATION_DURATION_SECONDS = Histogram(
 
 
 # Leaderboard/API queries
+# `sort` comes from the querystring: callers must map it onto the closed set
+# score_desc | date_desc | date_asc (anything else -> "other") before labeling,
+# otherwise every unique value creates a new series.
 LEADERBOARD_QUERIES_TOTAL = Counter(
     "leaderboard_queries_total",
     "Total leaderboard queries",
@@ -81,32 +87,20 @@ LEADERBOARD_QUERY_DURATION_SECONDS = Histogram(
     "Duration of leaderboard retrieval (including Redis/DB)",
 )
 
-# Celery queue backlog
-CELERY_QUEUE_LENGTH = Gauge(
-    "celery_queue_length",
-    "Length of Celery broker queue in Redis",
-    labelnames=("queue_name",),
+# API startup: 1 once the Redis leaderboard has been backfilled from the DB
+LEADERBOARD_WARMUP_COMPLETE = Gauge(
+    "leaderboard_warmup_complete",
+    "Leaderboard warmup status (1=complete, 0=in progress or failed)",
     **_gauge_kwargs,
 )
+LEADERBOARD_WARMUP_COMPLETE.set(0)
 
-# System health metrics
-DATABASE_HEALTH = Gauge(
-    "database_health",
-    "Database connection health status (1=healthy, 0=unhealthy)",
-    **_gauge_kwargs,
-)
+# Celery queue backlog: celery_queue_length is produced at scrape time by
+# CeleryQueueLengthCollector (see register_celery_queue_length_collector)
 
-REDIS_HEALTH = Gauge(
-    "redis_health",
-    "Redis connection health status (1=healthy, 0=unhealthy)",
-    **_gauge_kwargs,
-)
-
-CELERY_WORKER_HEALTH = Gauge(
-    "celery_worker_health",
-    "Celery worker health status (1=healthy, 0=unhealthy)",
-    **_gauge_kwargs,
-)
+# System health metrics
+# component_health{component=db|redis|celery|storage|overall} is produced at
+# scrape time by HealthCollector (see register_health_collector)
 
 CELERY_WORKER_COUNT = Gauge(
     "celery_worker_count",
@@ -127,86 +121,59 @@ CELERY_RESERVED_TASKS = Gauge(
     **_gauge_kwargs,
 )
 
-SUPABASE_STORAGE_HEALTH = Gauge(
-    "supabase_storage_health",
-    "Supabase storage health status (1=healthy, 0=unhealthy)",
-    **_gauge_kwargs,
-)
-
-OVERALL_SYSTEM_HEALTH = Gauge(
-    "overall_system_health",
-    "Overall system health status (1=healthy, 0=unhealthy)",
-    **_gauge_kwargs,
-)
-
-# Set initial values for health metrics so they appear in Prometheus
-DATABASE_HEALTH.set(0)  # Start as unhealthy until checked
-REDIS_HEALTH.set(0)  # Start as unhealthy until checked
-CELERY_WORKER_HEALTH.set(0)  # Start as unhealthy until checked
-SUPABASE_STORAGE_HEALTH.set(0)  # Start as unhealthy until checked
-OVERALL_SYSTEM_HEALTH.set(0)  # Start as unhealthy until checked
-
 
 def check_database_health():
-    """Check database health and update metrics"""
+    """Check database health"""
     try:
         from app.db.session import engine
         from sqlalchemy import text
         with engine.connect() as conn:
             conn.execute(text("SELECT 1"))
-        DATABASE_HEALTH.set(1)  # Healthy
         return True
     except Exception as e:
-        DATABASE_HEALTH.set(0)  # Unhealthy
         logging.getLogger(__name__).error(f"Database health check failed: {str(e)}")
         return False
 
 
 def check_redis_health():
-    """Check Redis health and update metrics"""
+    """Check Redis health"""
     try:
         import redis
         from app.core.config import settings
         r = redis.from_url(settings.REDIS_URL, socket_timeout=2)
         r.ping()
-        REDIS_HEALTH.set(1)  # Healthy
         return True
     except Exception as e:
-        REDIS_HEALTH.set(0)  # Unhealthy
         logging.getLogger(__name__).error(f"Redis health check failed: {str(e)}")
         return False
 
 
 def check_celery_worker_health():
-    """Check Celery worker health and update metrics"""
+    """Check Celery worker health and update worker/task gauges"""
     try:
         from app.core.celery import celery_app
         
         # Check 1: Basic ping with longer timeout
         pongs = celery_app.control.ping(timeout=5.0)
         if not isinstance(pongs, list) or len(pongs) == 0:
-            CELERY_WORKER_HEALTH.set(0)  # Unhealthy
             logging.getLogger(__name__).error("No Celery workers responding to ping")
             return False
         
         # Check 2: Get active workers and their stats
         stats = celery_app.control.inspect().stats()
         if not stats:
-            CELERY_WORKER_HEALTH.set(0)  # Unhealthy
             logging.getLogger(__name__).error("No Celery worker stats available")
             return False
         
         # Check 3: Get active tasks to see if workers are processing
         active = celery_app.control.inspect().active()
         if active is None:
-            CELERY_WORKER_HEALTH.set(0)  # Unhealthy
             logging.getLogger(__name__).error("Cannot get active tasks from workers")
             return False
         
         # Check 4: Get reserved tasks (tasks that have been received but not yet executed)
         reserved = celery_app.control.inspect().reserved()
         if reserved is None:
-            CELERY_WORKER_HEALTH.set(0)  # Unhealthy
             logging.getLogger(__name__).error("Cannot get reserved tasks from workers")
             return False
         
@@ -248,17 +215,15 @@ def check_celery_worker_health():
             f"Celery workers healthy: {worker_count} workers, {total_active} active tasks, {total_reserved} reserved tasks"
         )
         
-        CELERY_WORKER_HEALTH.set(1)  # Healthy
         return True
         
     except Exception as e:
-        CELERY_WORKER_HEALTH.set(0)  # Unhealthy
         logging.getLogger(__name__).error(f"Celery worker health check failed: {str(e)}")
         return False
 
 
 def check_supabase_storage_health():
-    """Check Supabase storage health and update metrics"""
+    """Check Supabase storage health"""
     try:
         from app.core.client import supabase_client
         from app.core.config import settings
@@ -267,31 +232,126 @@ def check_supabase_storage_health():
             supabase_client.storage.from_(bucket).list(path="", limit=1)
         except TypeError:
             supabase_client.storage.from_(bucket).list()
-        SUPABASE_STORAGE_HEALTH.set(1)  # Healthy
         return True
     except Exception as e:
-        SUPABASE_STORAGE_HEALTH.set(0)  # Unhealthy
         logging.getLogger(__name__).error(f"Supabase storage health check failed: {str(e)}")
         return False
 
 
 def check_overall_system_health():
-    """Check all system components and update overall health"""
-    db_ok = check_database_health()
-    redis_ok = check_redis_health()
-    celery_ok = check_celery_worker_health()
-    storage_ok = check_supabase_storage_health()
+    """Check all system components and compute overall health
+
+    The probes are independent I/O calls, so they run concurrently and a tick
+    takes as long as the slowest probe rather than the sum of all of them.
+    """
+    checks = {
+        "database": check_database_health,
+        "redis": check_redis_health,
+        "celery_workers": check_celery_worker_health,
+        "storage": check_supabase_storage_health,
+    }
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(checks)) as ex:
+        futs = {ex.submit(fn): name for name, fn in checks.items()}
+        for fut in as_completed(futs):
+            try:
+                results[futs[fut]] = bool(fut.result())
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Health check {futs[fut]} raised: {str(e)}")
+                results[futs[fut]] = False
+    db_ok = results["database"]
+    redis_ok = results["redis"]
+    celery_ok = results["celery_workers"]
+    storage_ok = results["storage"]
     
     overall_healthy = all([db_ok, redis_ok, celery_ok, storage_ok])
-    OVERALL_SYSTEM_HEALTH.set(1 if overall_healthy else 0)
     
-    return {
+    status = {
         "database": db_ok,
         "redis": redis_ok,
         "celery_workers": celery_ok,
         "storage": storage_ok,
         "overall": overall_healthy
     }
+    with _health_cache_lock:
+        _health_cache["at"] = time.monotonic()
+        _health_cache["status"] = status
+    return status
+
+
+# Last check_overall_system_health() result, written by the API probe loop
+_health_cache: dict = {"at": 0.0, "status": None}
+_health_cache_lock = Lock()
+
+
+def get_cached_system_health(max_age_seconds: float = 60.0) -> Optional[dict]:
+    """Return the last recorded health status without probing.
+
+    Returns None if no probe has finished yet or the snapshot is older than
+    max_age_seconds (i.e. the probe loop has stalled).
+    """
+    with _health_cache_lock:
+        status = _health_cache["status"]
+        at = _health_cache["at"]
+    if status is None or time.monotonic() - at >= max_age_seconds:
+        return None
+    return status
+
+
+# check_overall_system_health() key -> component_health label
+_HEALTH_COMPONENTS = (
+    ("database", "db"),
+    ("redis", "redis"),
+    ("celery_workers", "celery"),
+    ("storage", "storage"),
+    ("overall", "overall"),
+)
+
+
+class HealthCollector(Collector):
+    """Expose component_health from the last probe-loop snapshot at scrape time.
+
+    Never probes inline: /metrics is served on the event loop, and a probe
+    (Celery ping + inspect) can take seconds. A missing or stalled snapshot is
+    reported as unhealthy.
+    """
+
+    def __init__(self, max_age_seconds: float = 60.0):
+        self.max_age_seconds = max_age_seconds
+
+    def _family(self) -> GaugeMetricFamily:
+        return GaugeMetricFamily(
+            "component_health",
+            "Component health status (1=healthy, 0=unhealthy)",
+            labels=["component"],
+        )
+
+    def describe(self):
+        return [self._family()]
+
+    def collect(self):
+        family = self._family()
+        try:
+            status = get_cached_system_health(self.max_age_seconds) or {}
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Health metrics collection failed: {str(e)}")
+            status = {}
+        for key, component in _HEALTH_COMPONENTS:
+            family.add_metric([component], 1.0 if status.get(key) else 0.0)
+        yield family
+
+
+_health_collector: Optional[HealthCollector] = None
+
+
+def register_health_collector(registry=None) -> HealthCollector:
+    """Register the HealthCollector once per process (default REGISTRY)."""
+    global _health_collector
+    if _health_collector is None:
+        collector = HealthCollector()
+        (registry or REGISTRY).register(collector)
+        _health_collector = collector
+    return _health_collector
 
 
 # Environment listing
@@ -306,6 +366,10 @@ ENVIRONMENTS_LIST_FAILURES_TOTAL = Counter(
 )
 
 
+# Multiprocess registry shared by every init_fastapi_instrumentation() call
+_mp_registry = None
+
+
 def init_fastapi_instrumentation(app) -> None:
     """Attach Prometheus instrumentation and expose /metrics.
 
@@ -318,22 +382,35 @@ def init_fastapi_instrumentation(app) -> None:
         logging.getLogger(__name__).warning("fastapi_instrumentator_unavailable", extra={"error": str(e)})
         return
     
+    # Instrumenting twice (reload, test harness) would stack a second middleware
+    if getattr(app.state, "_prom_instrumented", False):
+        return
+
     # Check if we're in multiprocess mode
     mp_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
     if mp_dir:
-        # Use multiprocess collector
-        registry = CollectorRegistry()
-        multiprocess.MultiProcessCollector(registry)
-        instrumentator = Instrumentator(registry=registry)
+        # Use multiprocess collector; built once per process so reloads don't
+        # keep registering fresh collectors
+        global _mp_registry
+        if _mp_registry is None:
+            _mp_registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(_mp_registry)
+        instrumentator = Instrumentator(registry=_mp_registry)
     else:
         # Use the default registry that includes our custom metrics
         instrumentator = Instrumentator(registry=REGISTRY)
     
     instrumentator.instrument(app)
+    app.state._prom_instrumented = True
     # Don't expose the instrumentator's /metrics endpoint - we'll create our own
     # instrumentator.expose(app, include_in_schema=False)
 
 
+# Registry exposed by start_worker_metrics_server (the multiprocess registry
+# when PROMETHEUS_MULTIPROC_DIR is set); scrape-time collectors attach here
+_worker_registry = None
+
+
 def start_worker_metrics_server(port: Optional[int] = None) -> None:
     """Start a Prometheus metrics HTTP server for the worker process.
 
@@ -342,6 +419,7 @@ def start_worker_metrics_server(port: Optional[int] = None) -> None:
     prometheus_client.multiprocess.MultiProcessCollector so that counters
     aggregated from child processes are visible to Prometheus.
     """    
+    global _worker_registry
     logger = logging.getLogger(__name__)
     p = int(port or os.getenv("WORKER_METRICS_PORT", "9101"))
     logger.info(f"Starting worker metrics server on port {p}")
@@ -373,11 +451,12 @@ def start_worker_metrics_server(port: Optional[int] = None) -> None:
             registry = CollectorRegistry()
             multiprocess.MultiProcessCollector(registry)
             logger.info(f"Starting multiprocess HTTP server on 0.0.0.0:{p}")
-            start_http_server(p, addr='0.0.0.0', registry=registry)
+            start_http_server(p, addr="0.0.0.0", registry=registry)
+            _worker_registry = registry
             logger.info("Multiprocess HTTP server started successfully")
         else:
             logger.info(f"Starting single-process HTTP server on 0.0.0.0:{p}")
-            start_http_server(p, addr='0.0.0.0')
+            start_http_server(p, addr="0.0.0.0", registry=REGISTRY)
             logger.info("Single-process HTTP server started successfully")
     except OSError as e:
         # Port already in use; ignore to prevent crash in forked workers
@@ -386,78 +465,56 @@ def start_worker_metrics_server(port: Optional[int] = None) -> None:
         logger.error(f"Unexpected error starting worker metrics server: {str(e)}")
 
 
-def start_celery_queue_length_collector(
-    redis_url: Optional[str],
-    queue_names: Optional[list[str]] = None,
-    interval_seconds: int = 10,
-):
-    """Periodically collect Redis LLEN for Celery queues and export as a gauge.
+class CeleryQueueLengthCollector(Collector):
+    """Report Redis LLEN of the Celery queues as celery_queue_length.
 
-    Returns a stop_event that can be set() to stop the collector.
+    Runs at scrape time (one pipelined LLEN batch per scrape) instead of from
+    a polling thread, so values are fresh and nothing runs when nobody scrapes.
     """
-    queue_names = queue_names or ["celery"]
-    stop_event: Event = Event()
-
-    def _run():
-        client = None
-        while not stop_event.is_set():
-            try:
-                if client is None and redis_url:
-                    client = redis_lib.from_url(redis_url, socket_timeout=5)
-                for q in queue_names:
-                    try:
-                        llen = client.llen(q) if client is not None else 0
-                        CELERY_QUEUE_LENGTH.labels(queue_name=q).set(float(llen))
-                    except Exception as e:
-                        # Keep going for other queues
-                        logging.getLogger(__name__).debug("queue_length_collect_failed", extra={"queue": q, "error": str(e)})
-            except Exception as e:
-                client = None
-                logging.getLogger(__name__).debug("queue_length_loop_error", extra={"error": str(e)})
-            finally:
-                stop_event.wait(interval_seconds)
 
-    t = Thread(target=_run, daemon=True)
-    t.start()
-    return stop_event
+    def __init__(self, redis_url: Optional[str], queue_names: Optional[list[str]] = None):
+        self.redis_url = redis_url
+        self.queue_names = queue_names or ["celery"]
+        self._client = None
 
+    def _family(self) -> GaugeMetricFamily:
+        return GaugeMetricFamily(
+            "celery_queue_length",
+            "Length of Celery broker queue in Redis",
+            labels=["queue_name"],
+        )
 
-def start_health_metrics_collector(interval_seconds: int = 30):
-    """Periodically collect health metrics and export as gauges.
-
-    Returns a stop_event that can be set() to stop the collector.
-    """
-    stop_event: Event = Event()
+    def describe(self):
+        # Lets the registry learn the metric name without touching Redis
+        return [self._family()]
 
-    def _run():
-        while not stop_event.is_set():
+    def collect(self):
+        family = self._family()
+        if self.redis_url:
             try:
-                # Update all health metrics
-                check_overall_system_health()
-                logging.getLogger(__name__).debug("Health metrics updated successfully")
+                if self._client is None:
+                    self._client = redis_lib.from_url(self.redis_url, socket_timeout=5)
+                pipe = self._client.pipeline(transaction=False)
+                for q in self.queue_names:
+                    pipe.llen(q)
+                for q, llen in zip(self.queue_names, pipe.execute()):
+                    family.add_metric([q], float(llen or 0))
             except Exception as e:
-                logging.getLogger(__name__).error(f"Health metrics collection failed: {str(e)}")
-            finally:
-                stop_event.wait(interval_seconds)
-
-    t = Thread(target=_run, daemon=True)
-    t.start()
-    return stop_event
+                self._client = None
+                logging.getLogger(__name__).debug("queue_length_collect_failed", extra={"error": str(e)})
+        yield family
 
 
-class DurationTimer:
-    """Simple context manager to measure durations with perf_counter."""
-
-    def __init__(self):
-        self._start = 0.0
-        self.seconds = 0.0
-
-    def __enter__(self):
-        self._start = time.perf_counter()
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        self.seconds = max(0.0, time.perf_counter() - self._start)
-        return False
-
+def register_celery_queue_length_collector(
+    redis_url: Optional[str],
+    queue_names: Optional[list[str]] = None,
+    registry=None,
+) -> CeleryQueueLengthCollector:
+    """Register a CeleryQueueLengthCollector on the exported registry.
 
+    Defaults to the worker metrics server's registry (see
+    start_worker_metrics_server), falling back to the default REGISTRY.
+    """
+    collector = CeleryQueueLengthCollector(redis_url, queue_names)
+    (registry or _worker_registry or REGISTRY).register(collector)
+    return collector
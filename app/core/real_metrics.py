@@ -1,9 +1,11 @@
 import redis
-import json
-import time
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 from app.core.config import settings
 
+# Upper bounds of the evaluation duration buckets (same as the
+# evaluation_duration_seconds histogram); anything larger lands in "+Inf"
+EVALUATION_DURATION_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
 class RealMetricsTracker:
     """Track REAL metrics using Redis for persistence across processes"""
     
@@ -12,13 +14,20 @@ class RealMetricsTracker:
         self.metrics_prefix = "real_metrics:"
     
     def record_evaluation_duration(self, env_id: str, duration_seconds: float):
-        """Record REAL evaluation duration"""
-        key = f"{self.metrics_prefix}evaluation_duration:{env_id}"
-        self.redis_client.lpush(key, duration_seconds)
-        # Keep only last 1000 durations per environment
-        self.redis_client.ltrim(key, 0, 999)
+        """Record REAL evaluation duration into a fixed-bucket histogram hash"""
+        key = f"{self.metrics_prefix}evaluation_duration_hist:{env_id}"
+        field = "+Inf"
+        for edge in EVALUATION_DURATION_BUCKETS:
+            if duration_seconds <= edge:
+                field = str(edge)
+                break
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hincrby(key, field, 1)
+        pipe.hincrby(key, "count", 1)
+        pipe.hincrbyfloat(key, "sum", duration_seconds)
         # Set expiry to 7 days
-        self.redis_client.expire(key, 7 * 24 * 3600)
+        pipe.expire(key, 7 * 24 * 3600)
+        pipe.execute()
     
     def record_validation_failure(self, reason: str):
         """Record REAL validation failure"""
@@ -40,11 +49,27 @@ class RealMetricsTracker:
         self.redis_client.ltrim(duration_key, 0, 999)
         self.redis_client.expire(duration_key, 7 * 24 * 3600)
     
-    def get_evaluation_durations(self, env_id: str) -> List[float]:
-        """Get REAL evaluation durations for an environment"""
-        key = f"{self.metrics_prefix}evaluation_duration:{env_id}"
-        durations = self.redis_client.lrange(key, 0, -1)
-        return [float(d) for d in durations]
+    def get_evaluation_duration_histogram(self, env_id: str) -> Optional[Dict]:
+        """Get REAL evaluation duration histogram for an environment
+
+        Returns {"buckets": [(le, cumulative_count), ...], "sum": float,
+        "count": int} or None when nothing has been recorded.
+        """
+        key = f"{self.metrics_prefix}evaluation_duration_hist:{env_id}"
+        raw = self.redis_client.hgetall(key)
+        if not raw:
+            return None
+        fields = {k.decode(): v for k, v in raw.items()}
+        buckets = []
+        cumulative = 0
+        for edge in EVALUATION_DURATION_BUCKETS:
+            cumulative += int(fields.get(str(edge), 0))
+            buckets.append((edge, cumulative))
+        return {
+            "buckets": buckets,
+            "sum": float(fields.get("sum", 0.0)),
+            "count": int(fields.get("count", 0)),
+        }
     
     def get_validation_failures(self) -> Dict[str, int]:
         """Get REAL validation failure counts"""
@@ -3,10 +3,14 @@ from sqlalchemy.orm import sessionmaker, scoped_session
 from app.core.config import settings
 from app.db.base import Base
 
+_is_postgres = settings.DATABASE_URL.startswith("postgresql://")
+
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    connect_args={"connect_timeout": 30} if settings.DATABASE_URL.startswith("postgresql://") else {}
+    connect_args={"connect_timeout": 30} if _is_postgres else {},
+    # psycopg2: batch executemany() INSERTs/UPDATEs into multi-VALUES statements
+    **({"executemany_mode": "values_plus_batch"} if _is_postgres else {}),
 )
 
 
@@ -21,6 +25,49 @@ SessionLocal = sessionmaker(
 # Scoped session for thread safety
 db_session = scoped_session(SessionLocal)
 
+# Async engine/session factory (asyncpg) for async API handlers. Built lazily
+# so processes that never use it (Celery workers) don't need asyncpg.
+_async_session_factory = None
+
+
+def _async_engine_args():
+    """Translate DATABASE_URL (psycopg2 style) into an asyncpg URL + connect args."""
+    from sqlalchemy.engine import make_url
+    url = make_url(settings.DATABASE_URL)
+    connect_args = {}
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        query = dict(url.query)
+        # libpq-only parameters have asyncpg equivalents
+        sslmode = query.pop("sslmode", None)
+        if sslmode:
+            connect_args["ssl"] = sslmode
+        options = query.pop("options", None)
+        if options:
+            connect_args["server_settings"] = {"options": options}
+        # Poolers in transaction mode (Supabase 6543) can't keep prepared statements
+        connect_args["statement_cache_size"] = 0
+        connect_args["timeout"] = 30
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    return url, connect_args
+
+
+def get_async_sessionmaker():
+    """Return the process-wide async_sessionmaker, creating the engine on first use."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        url, connect_args = _async_engine_args()
+        async_engine = create_async_engine(url, pool_pre_ping=True, connect_args=connect_args)
+        _async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    return _async_session_factory
+
+
+async def get_async_db():
+    """Dependency for async FastAPI handlers to get an AsyncSession"""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
 def get_db():
     """Dependency for FastAPI to get database session"""
     db = SessionLocal()
@@ -29,13 +76,46 @@ def get_db():
     finally:
         db.close()
 
+def create_tables():
+    """Create any missing tables and indexes. Used by scripts/init_db.py and gated startup."""
+    Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist; add indexes declared since
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def create_tables_with_retry(attempts: int = 5, base_delay: float = 2.0) -> bool:
+    """create_tables() with exponential backoff, for the compose db-init service.
+    Never raises: on final failure the error is logged and False returned, so an
+    unreachable DB does not keep the API (which waits on db-init) from starting.
+    """
+    import logging
+    import time
+    logger = logging.getLogger(__name__)
+    for attempt in range(1, attempts + 1):
+        try:
+            create_tables()
+            logger.info("create_tables_succeeded", extra={"attempt": attempt})
+            return True
+        except Exception as e:
+            if attempt == attempts:
+                logger.error("create_tables_failed", extra={"attempts": attempts, "error": str(e)})
+                return False
+            delay = base_delay * 2 ** (attempt - 1)
+            logger.warning("create_tables_retry", extra={"attempt": attempt, "delay": delay, "error": str(e)})
+            time.sleep(delay)
+    return False
+
 def init_db():
-    """Initialize database - create tables.
+    """Initialize database - create tables when RUN_CREATE_ALL is enabled.
+    create_all issues a catalog query per table, so it is skipped on normal boots; run scripts/init_db.py once instead.
     If DB is temporarily unreachable, skip creation to allow API to start and healthcheck to pass; other endpoints will fail until DB returns.
     """
+    if not settings.RUN_CREATE_ALL:
+        return
     try:
-        Base.metadata.create_all(bind=engine)
+        create_tables()
     except Exception as e:
         # Log happens via caller; avoid crashing startup
         import logging
-        logging.getLogger(__name__).warning("init_db_create_all_failed", extra={"error": str(e)})
\ No newline at end of file
+        logging.getLogger(__name__).warning("init_db_create_all_failed", extra={"error": str(e)})
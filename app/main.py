@@ -2,6 +2,7 @@
 from fastapi import FastAPI
 from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import Response, PlainTextResponse
 from app.middleware.real_metrics import RealMetricsMiddleware
 from app.api import submissions, leaderboard
@@ -11,12 +12,21 @@ from app.api import metrics_endpoint, prometheus_metrics
 from app.db.session import init_db
 from app.core.config import settings
 from app.services.leaderboard import redis_leaderboard
-from app.core.metrics import init_fastapi_instrumentation, OVERALL_SYSTEM_HEALTH, DATABASE_HEALTH, REDIS_HEALTH, CELERY_WORKER_HEALTH, SUPABASE_STORAGE_HEALTH
+from app.core.metrics import init_fastapi_instrumentation, register_health_collector, LEADERBOARD_WARMUP_COMPLETE
 from app.core.logging_config import setup_logging
 import logging
 import os
 import asyncio
+import datetime
+import hashlib
+import secrets
+import threading
+import time
+from time import monotonic_ns
+from typing import Optional
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from cachetools import TTLCache
+import jwt
 
 # Configure logging (JSON)
 setup_logging()
@@ -36,6 +46,12 @@ try:
 except Exception as _e:
     logging.getLogger(__name__).exception("Prometheus metrics init failed", extra={"error": str(_e)})
 
+# component_health is read at scrape time from the probe loop's last snapshot
+try:
+    register_health_collector()
+except Exception as _e:
+    logging.getLogger(__name__).exception("Health collector registration failed", extra={"error": str(_e)})
+
 # Custom metrics endpoint that includes both FastAPI and custom metrics
 @app.get("/metrics")
 async def metrics():
@@ -64,6 +80,28 @@ app.add_middleware(
 app.add_middleware(RealMetricsMiddleware)
 
 
+class _GZipExceptStreams(GZipMiddleware):
+    """GZip responses, except SSE streams (the compressor would hold events back)."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope.get("path", "").endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Leaderboard JSON compresses well; skip tiny bodies
+app.add_middleware(_GZipExceptStreams, minimum_size=500)
+
+
+# Set once the background leaderboard warmup has finished
+_warmup_complete = False
+
+# Startup background tasks, kept referenced (the loop only holds weak refs)
+# and cancelled on shutdown
+app.state.background_tasks = set()
+
+
 # Initialize database, Redis, and metrics
 @app.on_event("startup")
 async def startup_event():
@@ -80,130 +118,176 @@ async def startup_event():
 
     # Prometheus /metrics already exposed at import time
 
-    # Initialize Redis leaderboard
-    try:
-        redis_leaderboard.connect()
-        logger.info("Redis leaderboard connected successfully")
-        # Backfill persistent entries and warm Redis
-        redis_leaderboard.sync_from_submissions()
-        redis_leaderboard.warm_redis_from_db()
-    except Exception as e:
-        logger.exception("Failed to initialize Redis leaderboard", extra={"error": str(e)})
-        logger.info("Will use database fallback for leaderboard")
+    # Initialize Redis leaderboard in the background so /health and /metrics
+    # are served while the backfill runs
+    async def _warmup():
+        global _warmup_complete
+        try:
+            await asyncio.to_thread(redis_leaderboard.connect)
+            logger.info("Redis leaderboard connected successfully")
+            # Backfill persistent entries and warm Redis
+            await asyncio.to_thread(redis_leaderboard.sync_from_submissions)
+            await asyncio.to_thread(redis_leaderboard.warm_redis_from_db)
+            _warmup_complete = True
+            LEADERBOARD_WARMUP_COMPLETE.set(1)
+            logger.info("Leaderboard warmup complete")
+        except Exception as e:
+            logger.exception("Failed to initialize Redis leaderboard", extra={"error": str(e)})
+            logger.info("Will use database fallback for leaderboard")
+    app.state.background_tasks.add(asyncio.create_task(_warmup()))
+
+    # Single background loop for periodic probes: visitor gauges every 30s and
+    # system health every 15s. Blocking work runs in threads, concurrently.
+    def _refresh_visitor_metrics():
+        try:
+            visitor.refresh_unique_visitor_metrics()
+        except Exception as e:
+            logging.getLogger(__name__).debug("visitor_metrics_refresh_loop_error", exc_info=e)
 
-    # Start background task to refresh unique visitor gauges
+    def _check_system_health():
+        from app.core.metrics import check_overall_system_health
+        try:
+            health_status = check_overall_system_health()
+            ts = datetime.datetime.utcnow().isoformat()
+            if not health_status["overall"]:
+                logging.getLogger(__name__).error(
+                    "system_health_check_failed",
+                    extra={
+                        "health_status": health_status,
+                        "timestamp": ts,
+                    }
+                )
+            else:
+                logging.getLogger(__name__).info(
+                    "system_health_check_passed",
+                    extra={
+                        "health_status": health_status,
+                        "timestamp": ts,
+                    }
+                )
+        except Exception as e:
+            logging.getLogger(__name__).error("system_health_check_failed", extra={"error": str(e)})
+
+    async def _probe_loop():
+        next_visitor = 0.0
+        next_health = 0.0
+        while True:
+            now = time.monotonic()
+            tasks = []
+            if now >= next_visitor:
+                tasks.append(asyncio.to_thread(_refresh_visitor_metrics))
+                next_visitor = now + 30
+            if now >= next_health:
+                tasks.append(asyncio.to_thread(_check_system_health))
+                next_health = now + 15
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.sleep(max(0.0, min(next_visitor, next_health) - time.monotonic()))
+
+    # The first tick runs immediately; it is the only writer of the health
+    # snapshot that the /metrics collector reads
     try:
-        async def _refresh_loop():
-            while True:
-                try:
-                    visitor.refresh_unique_visitor_metrics()
-                except Exception as e:
-                    logging.getLogger(__name__).debug("visitor_metrics_refresh_loop_error", extra={"error": str(e)})
-                await asyncio.sleep(30)
-        asyncio.create_task(_refresh_loop())
-        logger.info("Visitor metrics refresh loop started")
+        app.state.background_tasks.add(asyncio.create_task(_probe_loop()))
+        logger.info("Visitor metrics and system health probe loop started")
     except Exception as e:
-        logging.getLogger(__name__).warning("failed_to_start_refresh_loop", extra={"error": str(e)})
+        logging.getLogger(__name__).warning("failed_to_start_probe_loop", extra={"error": str(e)})
 
-    # Start background task to monitor all system components
-    try:
-        async def _system_health_loop():
-            import datetime
-            from app.core.metrics import check_overall_system_health
-            while True:
-                try:
-                    health_status = check_overall_system_health()
-                    if not health_status["overall"]:
-                        logging.getLogger(__name__).error(
-                            "system_health_check_failed",
-                            extra={
-                                "health_status": health_status,
-                                "timestamp": datetime.datetime.utcnow().isoformat(),
-                            }
-                        )
-                    else:
-                        logging.getLogger(__name__).info(
-                            "system_health_check_passed",
-                            extra={
-                                "health_status": health_status,
-                                "timestamp": datetime.datetime.utcnow().isoformat(),
-                            }
-                        )
-                except Exception as e:
-                    logging.getLogger(__name__).error("system_health_check_failed", extra={"error": str(e)})
-                await asyncio.sleep(15)  # Check every 15 seconds
-        asyncio.create_task(_system_health_loop())
-        logger.info("System health monitoring loop started")
-    except Exception as e:
-        logging.getLogger(__name__).warning("failed_to_start_system_health_loop", extra={"error": str(e)})
 
-    # Seed health gauges immediately so dashboards don't show "No data"
+@app.on_event("shutdown")
+async def shutdown_event():
+    tasks = app.state.background_tasks
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    tasks.clear()
+
+
+# Opaque per-request ids (16 hex chars)
+_token_hex = secrets.token_hex
+
+# Decoded visitor tokens keyed by sha256(token)[:16] -> (sub, exp). Failed
+# decodes are cached briefly so a flood of bad tokens isn't re-verified.
+_jwt_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+_jwt_fail_cache: TTLCache = TTLCache(maxsize=10000, ttl=5)
+_jwt_cache_lock = threading.Lock()
+
+
+def _visitor_id_from_token(token: str) -> Optional[str]:
+    """Return the visitor id (JWT `sub`) for a token, or None if it is invalid."""
+    key = hashlib.sha256(token.encode()).digest()[:16]
+    with _jwt_cache_lock:
+        if key in _jwt_fail_cache:
+            return None
+        hit = _jwt_cache.get(key)
+    if hit is not None and hit[1] > time.time():
+        return hit[0]
+
     try:
-        from app.core.metrics import check_overall_system_health
-        _ = check_overall_system_health()
+        payload = jwt.decode(
+            token,
+            settings.VISITOR_JWT_SECRET,
+            algorithms=["HS256"],
+            audience=settings.VISITOR_JWT_AUDIENCE,
+            issuer=settings.VISITOR_JWT_ISSUER,
+            options={"verify_exp": True},
+        )
     except Exception as e:
-        logging.getLogger(__name__).debug("initial_health_seed_failed", extra={"error": str(e)})
+        logging.getLogger(__name__).debug("request_middleware_jwt_decode_failed", exc_info=e)
+        with _jwt_cache_lock:
+            _jwt_fail_cache[key] = True
+        return None
+    visitor_id = payload.get("sub")
+    with _jwt_cache_lock:
+        _jwt_cache[key] = (visitor_id, payload.get("exp", 0))
+    return visitor_id
+
+
+_request_logger = logging.getLogger("request")
+
+
+def _request_log_extra(request_id, method, path, status_code, start_ns, client, visitor_id) -> dict:
+    return {
+        "request_id": request_id,
+        "method": method,
+        "path": path,
+        "status_code": status_code,
+        "duration_ms": (monotonic_ns() - start_ns) // 1_000_000,
+        "client": client,
+        "visitor_id": visitor_id,
+    }
 
 
 @app.middleware("http")
 async def request_logging_middleware(request: Request, call_next):
-    import time
-    from uuid import uuid4
-    logger = logging.getLogger("request")
-    start = time.perf_counter()
-    request_id = str(uuid4())
+    logger = _request_logger
+    start_ns = monotonic_ns()
+    request_id = _token_hex(8)
+    method = request.method
+    path = request.url.path
     client = request.client.host if request.client else "-"
 
     # Extract visitor token (JWT) if present
     visitor_id = None
     try:
-        import jwt
         token = request.cookies.get("visitor_token") or request.headers.get("X-Visitor-Token")
         if token:
-            try:
-                payload = jwt.decode(
-                    token,
-                    settings.VISITOR_JWT_SECRET,
-                    algorithms=["HS256"],
-                    audience=settings.VISITOR_JWT_AUDIENCE,
-                    issuer=settings.VISITOR_JWT_ISSUER,
-                    options={"verify_exp": True},
-                )
-                visitor_id = payload.get("sub")
-            except Exception as e:
-                logging.getLogger(__name__).debug("request_middleware_jwt_decode_failed", extra={"error": str(e)})
-                visitor_id = None
+            visitor_id = _visitor_id_from_token(token)
     except Exception as e:
-        logging.getLogger(__name__).debug("request_middleware_token_extraction_failed", extra={"error": str(e)})
+        logging.getLogger(__name__).debug("request_middleware_token_extraction_failed", exc_info=e)
         visitor_id = None
 
+    # Only build the extra dict when the record will actually be emitted
     try:
         response = await call_next(request)
-        duration_ms = int((time.perf_counter() - start) * 1000)
-        extra = {
-            "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": getattr(response, "status_code", 0),
-            "duration_ms": duration_ms,
-            "client": client,
-            "visitor_id": visitor_id,
-        }
-        logger.info("request_completed", extra=extra)
-        return response
     except Exception:
-        duration_ms = int((time.perf_counter() - start) * 1000)
-        extra = {
-            "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": 500,
-            "duration_ms": duration_ms,
-            "client": client,
-            "visitor_id": visitor_id,
-        }
-        logger.exception("request_failed", extra=extra)
+        if logger.isEnabledFor(logging.ERROR):
+            logger.exception("request_failed", extra=_request_log_extra(request_id, method, path, 500, start_ns, client, visitor_id))
         raise
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("request_completed", extra=_request_log_extra(
+            request_id, method, path, response.status_code, start_ns, client, visitor_id
+        ))
+    return response
 
 # Include API routes
 app.include_router(submissions.router, prefix="/api", tags=["submissions"])
@@ -227,7 +311,6 @@ def robots_txt():
 
 @app.get("/sitemap.xml")
 def sitemap_xml():
-    import datetime
     base = settings.PUBLIC_BASE_URL.rstrip("/") if settings.PUBLIC_BASE_URL else ""
     now = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
     # Known public routes. Gradio is typically served under a separate service; list root if base set.
@@ -249,72 +332,123 @@ def sitemap_xml():
     )
     return Response(content=body, media_type="application/xml")
 
-@app.get("/health")
-def health_check():
-    """Liveness + Readiness: verify core dependencies (DB, Redis).
+# Redis clients reused across /health probes; reset to None on failure so the
+# next probe reconnects
+_health_redis = None
+_health_broker = None
+
+
+def _get_health_redis(attr: str, url: str):
+    client = globals()[attr]
+    if client is None:
+        import redis as _redis
+        client = _redis.Redis.from_url(
+            url,
+            socket_timeout=2,
+            socket_connect_timeout=2,
+            socket_keepalive=True,
+            health_check_interval=30,
+        )
+        globals()[attr] = client
+    return client
 
-    Returns JSON with overall status and component statuses. If any component
-    check fails, status is "unhealthy".
-    """
-    import datetime
+
+def _check_db() -> str:
     from sqlalchemy import text
-    import redis as _redis
-    logger = logging.getLogger(__name__)
+    from app.db.session import engine
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return "ok"
 
-    statuses: dict[str, str] = {}
-    # DB check
-    try:
-        from app.db.session import engine
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        statuses["database"] = "ok"
-    except Exception as e:
-        statuses["database"] = f"error: {e}"
+
+def _check_redis() -> str:
     # Redis (leaderboard) check
     try:
-        r = _redis.from_url(settings.REDIS_URL, socket_timeout=2)
-        r.ping()
-        statuses["redis"] = "ok"
-    except Exception as e:
-        statuses["redis"] = f"error: {e}"
+        _get_health_redis("_health_redis", settings.REDIS_URL).ping()
+    except Exception:
+        globals()["_health_redis"] = None
+        raise
+    return "ok"
+
 
+def _check_broker() -> str:
     # Celery broker check (may use a different Redis DB)
     try:
-        broker = _redis.from_url(getattr(settings, "CELERY_BROKER_URL", settings.REDIS_URL), socket_timeout=2)
-        broker.ping()
-        statuses["broker"] = "ok"
-    except Exception as e:
-        statuses["broker"] = f"error: {e}"
+        _get_health_redis("_health_broker", getattr(settings, "CELERY_BROKER_URL", settings.REDIS_URL)).ping()
+    except Exception:
+        globals()["_health_broker"] = None
+        raise
+    return "ok"
 
+
+# Last Celery ping outcome as (monotonic timestamp, status string); reused for
+# _CELERY_PING_TTL_SECONDS so frequent probes don't each broadcast to the broker
+_last_celery_ping = (0.0, "")
+_CELERY_PING_TTL_SECONDS = 10.0
+
+
+def _check_celery() -> str:
     # Celery worker(s) check via control ping
-    try:
-        from app.core.celery import celery_app
-        
-        # Check 1: Basic ping with shorter timeout for blackbox
-        pongs = celery_app.control.ping(timeout=1.0)
-        if not isinstance(pongs, list) or len(pongs) == 0:
-            statuses["celery_workers"] = "error: no workers responding"
-        else:
-            # For blackbox health checks, just use ping to be fast
-            statuses["celery_workers"] = f"ok: {len(pongs)} workers responding"
-    except Exception as e:
-        statuses["celery_workers"] = f"error: {e}"
+    global _last_celery_ping
+    ts, cached = _last_celery_ping
+    if cached and time.monotonic() - ts < _CELERY_PING_TTL_SECONDS:
+        return cached
+
+    from app.core.celery import celery_app
+
+    # Basic ping with short timeout for blackbox
+    pongs = celery_app.control.ping(timeout=0.5)
+    if not isinstance(pongs, list) or len(pongs) == 0:
+        status = "error: no workers responding"
+    else:
+        # For blackbox health checks, just use ping to be fast
+        status = f"ok: {len(pongs)} workers responding"
+    _last_celery_ping = (time.monotonic(), status)
+    return status
+
 
+def _check_storage() -> str:
     # Supabase Storage check (bucket access)
+    from app.core.client import supabase_client
+    bucket = settings.SUPABASE_BUCKET
+    # list may vary by SDK version; try a minimal call
     try:
-        from app.core.client import supabase_client
-        bucket = settings.SUPABASE_BUCKET
-        # list may vary by SDK version; try a minimal call
-        try:
-            supabase_client.storage.from_(bucket).list(path="", limit=1)
-        except TypeError:
-            # older SDK signature
-            supabase_client.storage.from_(bucket).list()
-        statuses["storage"] = "ok"
-    except Exception as e:
-        statuses["storage"] = f"error: {e}"
+        supabase_client.storage.from_(bucket).list(path="", limit=1)
+    except TypeError:
+        # older SDK signature
+        supabase_client.storage.from_(bucket).list()
+    return "ok"
+
+
+_HEALTH_CHECKS = (
+    ("database", _check_db),
+    ("redis", _check_redis),
+    ("broker", _check_broker),
+    ("celery_workers", _check_celery),
+    ("storage", _check_storage),
+)
+
+
+@app.get("/health")
+async def health_check():
+    """Liveness + Readiness: verify core dependencies (DB, Redis).
+
+    Returns JSON with overall status and component statuses. If any component
+    check fails, status is "unhealthy". Checks run concurrently in threads, so
+    latency is that of the slowest dependency rather than the sum.
+    """
+    logger = logging.getLogger(__name__)
+
+    results = await asyncio.gather(
+        *(asyncio.to_thread(check) for _, check in _HEALTH_CHECKS),
+        return_exceptions=True,
+    )
+    statuses: dict[str, str] = {}
+    for (name, _), result in zip(_HEALTH_CHECKS, results):
+        statuses[name] = f"error: {result}" if isinstance(result, BaseException) else result
 
     healthy = all(v.startswith("ok") for v in statuses.values())
+    ts = datetime.datetime.utcnow().isoformat()
     
     # Log health status for monitoring
     if not healthy:
@@ -323,7 +457,7 @@ def health_check():
             extra={
                 "status": "unhealthy",
                 "components": statuses,
-                "timestamp": datetime.datetime.utcnow().isoformat(),
+                "timestamp": ts,
             }
         )
     else:
@@ -332,14 +466,15 @@ def health_check():
             extra={
                 "status": "healthy",
                 "components": statuses,
-                "timestamp": datetime.datetime.utcnow().isoformat(),
+                "timestamp": ts,
             }
         )
     
     return {
         "status": "healthy" if healthy else "unhealthy",
         "components": statuses,
-        "timestamp": datetime.datetime.utcnow().isoformat(),
+        "warmup": "complete" if _warmup_complete else "starting",
+        "timestamp": ts,
     }
 
 
@@ -5,13 +5,13 @@ from app.core.real_metrics import real_metrics
 
 class RealMetricsMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         
         # Process the request
         response = await call_next(request)
         
         # Calculate duration
-        duration = time.time() - start_time
+        duration = (time.monotonic_ns() - start_ns) / 1e9
         
         # Record REAL HTTP metrics
         status_code = str(response.status_code)
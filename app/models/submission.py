@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, String, Float, DateTime
+from sqlalchemy import Column, String, Float, DateTime, Index
 from datetime import datetime
 from app.db.base import Base
 
@@ -23,6 +23,25 @@ class LeaderboardEntry(Base):
     submission_id = Column(String, index=True)
     user_id = Column(String, index=True)
     env_id = Column(String, index=True)
-    algorithm = Column(String, index=True)
+    algorithm = Column(String)  # only filtered with ILIKE '%..%', which can't use a btree
     score = Column(Float, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# Leaderboard reads are `WHERE env_id = ? ORDER BY score DESC, created_at, id LIMIT N`
+# (and the date-sorted variants); full sort keys let the planner stop at LIMIT
+Index(
+    "ix_lb_env_score_ts",
+    LeaderboardEntry.env_id,
+    LeaderboardEntry.score.desc(),
+    LeaderboardEntry.created_at,
+    LeaderboardEntry.id,
+)
+Index(
+    "ix_lb_env_created",
+    LeaderboardEntry.env_id,
+    LeaderboardEntry.created_at.desc(),
+    LeaderboardEntry.score.desc(),
+    LeaderboardEntry.id,
+)
+Index("ix_lb_env_user", LeaderboardEntry.env_id, LeaderboardEntry.user_id)
@@ -1,23 +1,35 @@
 
 import logging
-from sqlalchemy.orm import Session
+from time import perf_counter
+from sqlalchemy.orm import load_only
 from app.db.session import SessionLocal
 from app.models import Submission
 from app.core.docker import run_evaluation_container
 from app.core.config import settings
-from app.services.leaderboard import redis_leaderboard
+from app.services.leaderboard import redis_leaderboard, stage_leaderboard_entry
 from app.core.metrics import (
     EVALUATION_STARTED_TOTAL,
     EVALUATION_COMPLETED_TOTAL,
     EVALUATION_FAILED_TOTAL,
     EVALUATION_DURATION_SECONDS,
-    DurationTimer,
 )
 from app.core.real_metrics import real_metrics
 from app.core.client import supabase_client
 
 logger = logging.getLogger(__name__)
 
+# Columns evaluate_submission (and the leaderboard publish) actually reads;
+# the free-text `error` and `duration_seconds` are only ever written here
+_EVAL_COLUMNS = load_only(
+    Submission.id,
+    Submission.user_id,
+    Submission.env_id,
+    Submission.algorithm,
+    Submission.score,
+    Submission.status,
+    Submission.created_at,
+)
+
 def _cleanup_submission_artifacts(submission_id: str) -> None:
     """Best-effort removal of uploaded artifacts from Supabase storage.
 
@@ -50,15 +62,18 @@ def evaluate_submission(submission_id: str) -> dict:
     Evaluate a submission by running it in a secure container
     """
     db = SessionLocal()
+    submission = None
+    publish_to_leaderboard = False
     
     try:
-        # Get submission
-        submission = db.query(Submission).get(submission_id)
+        # Get submission (loaded once; reused by the error path below)
+        submission = db.get(Submission, submission_id, options=[_EVAL_COLUMNS])
         if not submission:
             logger.error(f"Submission {submission_id} not found in database")
             return {"status": "error", "message": "Submission not found"}
         
-        # Update status to processing
+        # Single-column UPDATE so DB-only readers (admin queries, Grafana) see
+        # the job running; the terminal status is written after the run
         submission.status = "processing"
         db.commit()
         logger.info(
@@ -72,11 +87,12 @@ def evaluate_submission(submission_id: str) -> dict:
         
         # Run in isolated container
         EVALUATION_STARTED_TOTAL.inc()
-        with DurationTimer() as timer:
-            result = run_evaluation_container(
-                submission_id=submission_id,
-                env_id=submission.env_id
-            )
+        t0 = perf_counter()
+        result = run_evaluation_container(
+            submission_id=submission_id,
+            env_id=submission.env_id
+        )
+        duration_seconds = perf_counter() - t0
         
         # Process results
         parsed_output = result.get("output", {}) if isinstance(result, dict) else {}
@@ -85,7 +101,7 @@ def evaluate_submission(submission_id: str) -> dict:
         if is_success:
             # Successful evaluation
             submission.score = parsed_output["score"]
-            submission.duration_seconds = timer.seconds  # Store REAL duration
+            submission.duration_seconds = duration_seconds  # Store REAL duration
             submission.status = "completed"
 
             # Detailed per-episode metrics removed
@@ -98,36 +114,26 @@ def evaluate_submission(submission_id: str) -> dict:
                     "algorithm": submission.algorithm,
                 },
             )
+            stage_leaderboard_entry(db, submission)
             db.commit()
+            publish_to_leaderboard = True
             try:
                 EVALUATION_COMPLETED_TOTAL.labels(env_id=submission.env_id).inc()
-                EVALUATION_DURATION_SECONDS.labels(env_id=submission.env_id).observe(timer.seconds)
+                EVALUATION_DURATION_SECONDS.labels(env_id=submission.env_id).observe(duration_seconds)
                 # Record REAL metrics in Redis
-                real_metrics.record_evaluation_duration(submission.env_id, timer.seconds)
+                real_metrics.record_evaluation_duration(submission.env_id, duration_seconds)
             except Exception as e:
                 logger.debug(
                     "metrics_update_failed_after_success",
                     extra={
                         "submission_id": submission_id,
-                        "error": str(e),
-                    },
-                )
-            # Push to Redis leaderboard for immediate visibility
-            try:
-                redis_leaderboard.add_submission(submission)
-            except Exception as e:
-                logger.error(
-                    f"Failed to update Redis leaderboard for {submission_id}: {str(e)}",
-                    extra={
-                        "submission_id": submission_id,
-                        "env_id": submission.env_id,
-                        "algorithm": submission.algorithm,
                     },
+                    exc_info=e,
                 )
             return {
                 "status": "completed", 
                 "score": submission.score,
-                "duration_seconds": timer.seconds,  # Include REAL duration
+                "duration_seconds": duration_seconds,  # Include REAL duration
                 "name": submission.user_id,  # user_id field stores the name
                 "submission_id": submission_id,
                 "env_id": submission.env_id,
@@ -152,37 +158,26 @@ def evaluate_submission(submission_id: str) -> dict:
             f"Evaluation failed for {submission_id}: {error_msg}",
             extra={
                 "submission_id": submission_id,
-                "env_id": submission.env_id if 'submission' in locals() and submission else None,
-                "algorithm": submission.algorithm if 'submission' in locals() and submission else None,
+                "env_id": submission.env_id if submission else None,
+                "algorithm": submission.algorithm if submission else None,
             },
         )
 
-        # Commit final status
+        # Commit final status; failed submissions are also published (negative score)
+        stage_leaderboard_entry(db, submission)
         db.commit()
-        
-        # Add failed submission to leaderboard with negative score
-        try:
-            redis_leaderboard.add_submission(submission)
-        except Exception as e:
-            logger.error(
-                f"Failed to update Redis leaderboard for failed submission {submission_id}: {str(e)}",
-                extra={
-                    "submission_id": submission_id,
-                    "env_id": submission.env_id,
-                    "algorithm": submission.algorithm,
-                },
-            )
+        publish_to_leaderboard = True
         
         try:
             EVALUATION_FAILED_TOTAL.labels(reason="script_error").inc()
-            EVALUATION_DURATION_SECONDS.labels(env_id=submission.env_id).observe(timer.seconds)
+            EVALUATION_DURATION_SECONDS.labels(env_id=submission.env_id).observe(duration_seconds)
         except Exception as e:
             logger.debug(
                 "metrics_update_failed_after_failure",
                 extra={
                     "submission_id": submission_id,
-                    "error": str(e),
                 },
+                exc_info=e,
             )
         return {"status": "failed", "error": error_msg}
     
@@ -198,21 +193,15 @@ def evaluate_submission(submission_id: str) -> dict:
         
         if db:
             try:
-                submission = db.query(Submission).get(submission_id)
+                if submission is None:
+                    submission = db.get(Submission, submission_id, options=[_EVAL_COLUMNS])
                 if submission:
                     submission.status = "failed"
                     submission.score = -1000000.0  # Default negative score for system errors
                     submission.error = f"System error: {error_msg[:500]}"
+                    stage_leaderboard_entry(db, submission)
                     db.commit()
-                    
-                    # Add failed submission to leaderboard
-                    try:
-                        redis_leaderboard.add_submission(submission)
-                    except Exception as lb_error:
-                        logger.error(
-                            f"Failed to update Redis leaderboard for system error submission {submission_id}: {str(lb_error)}",
-                            extra={"submission_id": submission_id},
-                        )
+                    publish_to_leaderboard = True
             except Exception as db_error:
                 logger.error(
                     f"Failed to update DB after error: {str(db_error)}",
@@ -224,18 +213,28 @@ def evaluate_submission(submission_id: str) -> dict:
         except Exception as e:
             logger.debug(
                 "artifact_cleanup_failed",
-                extra={"submission_id": submission_id, "error": str(e)},
+                extra={"submission_id": submission_id},
+                exc_info=e,
             )
         return {
             "status": "error", 
             "message": error_msg,
-            "name": submission.user_id,  # user_id field stores the name
+            "name": submission.user_id if submission else None,  # user_id field stores the name
             "submission_id": submission_id,
-            "env_id": submission.env_id,
-            "algorithm": submission.algorithm
+            "env_id": submission.env_id if submission else None,
+            "algorithm": submission.algorithm if submission else None
         }
     
     finally:
+        # Single leaderboard write path for every terminal outcome
+        if publish_to_leaderboard and submission is not None:
+            try:
+                redis_leaderboard.add_submission(submission)
+            except Exception as e:
+                logger.error(
+                    f"Failed to update Redis leaderboard for {submission_id}: {str(e)}",
+                    extra={"submission_id": submission_id},
+                )
         # Best-effort artifact cleanup regardless of outcome
         try:
             _cleanup_submission_artifacts(submission_id)
@@ -1,65 +1,237 @@
 
 import logging
 import json
+import threading
+import time
 import redis
+from cachetools import TTLCache
+from itertools import groupby
+from typing import NamedTuple
 from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.core.config import settings
 from app.models import Submission, LeaderboardEntry
 from app.db.session import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Top-N ids, scores and JSON detail blobs in one server-side call: ZRANGE
+# BYSCORE REV LIMIT over [ARGV[4], ARGV[3]] (score filters pushed into Redis),
+# then a single MGET for all detail keys. Returns a flat array
+# [id1, score1, blob1, ...] (blob nil if missing; MGET also yields nil for
+# legacy hash-typed keys), or nil when the leaderboard itself is empty so the
+# caller can tell "no data" from "nothing in range". When the page is full,
+# every member tied with the last score is returned too (up to
+# _TIE_FETCH_MAX): REV orders ties reverse-lex by id, so the caller must see
+# them all to apply the created_at tie-break at the cut. fetch_count plus the
+# tie cap stays below Lua's unpack() limit.
+_TOP_ENTRIES_LUA = """
+if redis.call('ZCARD', KEYS[1]) == 0 then
+    return false
+end
+local ranked = redis.call(
+    'ZRANGE', KEYS[1], ARGV[3], ARGV[4], 'BYSCORE', 'REV', 'LIMIT', 0, tonumber(ARGV[1]), 'WITHSCORES'
+)
+if #ranked == 0 then
+    return {}
+end
+if #ranked == 2 * tonumber(ARGV[1]) then
+    local last = ranked[#ranked]
+    while #ranked > 0 and ranked[#ranked] == last do
+        ranked[#ranked] = nil
+        ranked[#ranked] = nil
+    end
+    local ties = redis.call(
+        'ZRANGE', KEYS[1], last, last, 'BYSCORE', 'LIMIT', 0, tonumber(ARGV[5]), 'WITHSCORES'
+    )
+    for i = 1, #ties do
+        ranked[#ranked + 1] = ties[i]
+    end
+end
+local keys = {}
+for i = 1, #ranked, 2 do
+    keys[#keys + 1] = ARGV[2] .. ranked[i]
+end
+local blobs = redis.call('MGET', unpack(keys))
+local out = {}
+for i = 1, #keys do
+    out[#out + 1] = ranked[2 * i - 1]
+    out[#out + 1] = ranked[2 * i]
+    out[#out + 1] = blobs[i]
+end
+return out
+"""
+
+_UPSERT_CHUNK = 1000
+_TIE_FETCH_MAX = 4000
+_WARM_FLUSH_EVERY = 500
+
+
+def _entry_row(submission) -> dict:
+    """LeaderboardEntry column values for a submission (ORM object or column row)."""
+    return {
+        'id': submission.id,
+        'submission_id': submission.id,
+        'user_id': submission.user_id,
+        'env_id': submission.env_id,
+        'algorithm': submission.algorithm,
+        'score': submission.score,
+        'created_at': submission.created_at,
+    }
+
+
+def _upsert_leaderboard_entries(db, rows: list[dict]) -> None:
+    """Upsert LeaderboardEntry rows by primary key.
+
+    Postgres gets a multi-row INSERT ... ON CONFLICT (id) DO UPDATE, which skips
+    the per-row SELECT that Session.merge() issues; other backends fall back to merge.
+    """
+    if not rows:
+        return
+    if db.get_bind().dialect.name != "postgresql":
+        for row in rows:
+            db.merge(LeaderboardEntry(**row))
+        return
+    for i in range(0, len(rows), _UPSERT_CHUNK):
+        stmt = pg_insert(LeaderboardEntry).values(rows[i:i + _UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LeaderboardEntry.id],
+            set_={k: stmt.excluded[k] for k in rows[0] if k != 'id'},
+        )
+        db.execute(stmt)
+
+
+def stage_leaderboard_entry(db, submission) -> None:
+    """Add submission's LeaderboardEntry upsert to db's open transaction.
+
+    Called just before the caller commits the submission's terminal status, so
+    the durable leaderboard row lands in the same commit. Runs in a SAVEPOINT:
+    a failed upsert is logged and never blocks the status update.
+    """
+    if submission.score is None:
+        return
+    try:
+        with db.begin_nested():
+            _upsert_leaderboard_entries(db, [_entry_row(submission)])
+    except Exception as e:
+        logger.error(f"Failed to stage leaderboard entry for {submission.id}: {str(e)}")
+
+
+_SUBMISSION_KEY_PREFIX = "submission:"
+
+
+def _leaderboard_key(env_id: str) -> str:
+    return f"leaderboard:{env_id}"
+
+
+def _submission_key(submission_id: str) -> str:
+    return f"{_SUBMISSION_KEY_PREFIX}{submission_id}"
+
+
+# Rendered get_leaderboard() responses: one hash per env, one field per
+# (version, parameter combination). The hash lives _RESPONSE_CACHE_TTL_SECONDS from its
+# first fill and is dropped on any write to the env's leaderboard.
+_RESPONSE_CACHE_TTL_SECONDS = 3
+
+
+def _response_cache_key(env_id: str) -> str:
+    return f"lb:cache:{env_id}"
+
+
+def _version_key(env_id: str) -> str:
+    """Counter bumped on every write to an env's leaderboard (backs the API's ETag)."""
+    return f"lb:version:{env_id}"
+
+
+def leaderboard_changes_channel(env_id: str) -> str:
+    """Pub/sub channel announcing that an env's leaderboard changed (feeds /api/leaderboard/stream)."""
+    return f"lb:changed:{env_id}"
+
+
+# In-process memo for the dominant unfiltered score_desc page, keyed by
+# (env_id, limit); checked before the Redis response cache. Bounded, since
+# env_id and limit come from the query string
+_PAGE_CACHE_TTL_SECONDS = 2.0
+_PAGE_CACHE_MAXSIZE = 256
+
+
+# Shared pool: every client built from it reuses connections across calls
+_POOL = redis.ConnectionPool.from_url(
+    settings.REDIS_URL,
+    max_connections=64,
+    socket_connect_timeout=5,
+    socket_timeout=5,
+    socket_keepalive=True,
+    retry_on_timeout=True,
+    # Replies come back as str (decoded by the hiredis parser when installed)
+    decode_responses=True,
+    # Only PING a pooled connection that has been idle for 30s
+    health_check_interval=30,
+)
+if settings.REDIS_LEADERBOARD_DB is not None:
+    # from_url() lets the URL's /db win over a db= kwarg, so override here
+    _POOL.connection_kwargs["db"] = settings.REDIS_LEADERBOARD_DB
+
+class _Entry(NamedTuple):
+    """One decoded leaderboard row on the Redis read path."""
+    id: str
+    user_id: str | None
+    algorithm: str | None
+    score: float
+    created_at: str | None  # ISO string, passed through to the response
+    created_ts: float | None  # epoch seconds, used for filtering/sorting
+    env_id: str | None
+
+
 class RedisLeaderboard:
     """Redis-powered leaderboard with real-time sorting"""
     
     def __init__(self):
-        self.redis_client = None
-        self.leaderboard_key = "leaderboard:{env_id}"
-        self.submission_key = "submission:{submission_id}"
+        # Clients are cheap wrappers around the shared pool; no I/O happens here
+        self.redis_client = redis.Redis(connection_pool=_POOL)
+        self._top_entries = self.redis_client.register_script(_TOP_ENTRIES_LUA)
+        # (env_id, limit) -> (version, rows); TTLCache drops expired pages on access
+        self._page_cache: TTLCache = TTLCache(maxsize=_PAGE_CACHE_MAXSIZE, ttl=_PAGE_CACHE_TTL_SECONDS)
+        self._page_cache_lock = threading.Lock()
         
     def connect(self):
-        """Connect to Redis with proper configuration"""
+        """Verify the pooled Redis connection is reachable"""
         try:
-            self.redis_client = redis.from_url(
-                settings.REDIS_URL,  # This uses DB 0
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True
-            )
-            # Test connection
             self.redis_client.ping()
-            logger.info("Connected to Redis leaderboard (DB 0)")
+            logger.info(f"Connected to Redis leaderboard (DB {_POOL.connection_kwargs.get('db', 0)})")
         except Exception as e:
             logger.critical(f"Failed to connect to Redis: {str(e)}")
             raise
 
     def sync_from_submissions(self, limit: int = 10000):
-        """Backfill persistent leaderboard entries from completed submissions.
+        """Backfill persistent leaderboard entries from finished submissions.
+
+        Covers the same rows evaluation publishes: completed submissions and
+        failed ones carrying the sentinel negative score.
 
         This ensures DB durability even if older runs happened before this feature
-        or if Redis was empty. Safe to run repeatedly (uses merge/upsert).
+        or if Redis was empty. Safe to run repeatedly (upserts by primary key).
         """
         try:
             db = SessionLocal()
+            # Plain column tuples: no ORM identity-map hydration for up to `limit` rows
             rows = (
-                db.query(Submission)
-                .filter(Submission.status == "completed")
+                db.query(
+                    Submission.id,
+                    Submission.user_id,
+                    Submission.env_id,
+                    Submission.algorithm,
+                    Submission.score,
+                    Submission.created_at,
+                )
+                .filter(Submission.status.in_(("completed", "failed")))
                 .filter(Submission.score.isnot(None))
                 .order_by(Submission.created_at.asc())
                 .limit(limit)
                 .all()
             )
-            for s in rows:
-                entry = LeaderboardEntry(
-                    id=s.id,
-                    submission_id=s.id,
-                    user_id=s.user_id,
-                    env_id=s.env_id,
-                    algorithm=s.algorithm,
-                    score=s.score,
-                    created_at=s.created_at,
-                )
-                db.merge(entry)
+            _upsert_leaderboard_entries(db, [_entry_row(s) for s in rows])
             db.commit()
             logger.info(f"Backfilled {len(rows)} leaderboard entries from submissions")
         except Exception as e:
@@ -72,44 +244,58 @@ class RedisLeaderboard:
 
     def warm_redis_from_db(self, limit_per_env: int = 1000):
         """Populate Redis sorted sets from persistent DB entries."""
-        if not self.redis_client:
-            self.connect()
         try:
             db = SessionLocal()
-            # Distinct env_ids
-            env_ids = [r[0] for r in db.query(LeaderboardEntry.env_id).distinct().all()]
-            for env_id in env_ids:
-                rows = (
-                    db.query(LeaderboardEntry)
-                    .filter(LeaderboardEntry.env_id == env_id)
-                    .order_by(LeaderboardEntry.score.desc(), LeaderboardEntry.created_at.asc())
-                    .limit(limit_per_env)
-                    .all()
-                )
-                if not rows:
-                    continue
-                leaderboard_key = self.leaderboard_key.format(env_id=env_id)
-                # Clear existing to avoid stale data
-                try:
-                    self.redis_client.delete(leaderboard_key)
-                except Exception as e:
-                    logger.debug("redis_delete_leaderboard_failed", extra={"env_id": env_id, "error": str(e)})
-                # Write fresh
-                for row in rows:
-                    self.redis_client.zadd(leaderboard_key, {row.id: float(row.score)})
-                    submission_key = self.submission_key.format(submission_id=row.id)
-                    self.redis_client.hset(
-                        submission_key,
-                        mapping={
-                            'user_id': row.user_id or 'Unknown',
-                            'algorithm': row.algorithm or 'Unknown',
-                            'score': float(row.score),
-                            'created_at': row.created_at.isoformat(),
-                            'env_id': row.env_id,
-                        },
-                    )
-                    self.redis_client.expire(leaderboard_key, 30*24*60*60)
-                    self.redis_client.expire(submission_key, 30*24*60*60)
+            # Top limit_per_env rows of every env in one query (ROW_NUMBER per env)
+            rn = func.row_number().over(
+                partition_by=LeaderboardEntry.env_id,
+                order_by=(LeaderboardEntry.score.desc(), LeaderboardEntry.created_at.asc()),
+            ).label("rn")
+            ranked = db.query(
+                LeaderboardEntry.id,
+                LeaderboardEntry.user_id,
+                LeaderboardEntry.env_id,
+                LeaderboardEntry.algorithm,
+                LeaderboardEntry.score,
+                LeaderboardEntry.created_at,
+                rn,
+            ).subquery()
+            top_rows = (
+                db.query(ranked)
+                .filter(ranked.c.rn <= limit_per_env)
+                .order_by(ranked.c.env_id, ranked.c.rn)
+                .all()
+            )
+            for env_id, group in groupby(top_rows, key=lambda r: r.env_id):
+                rows = list(group)
+                leaderboard_key = _leaderboard_key(env_id)
+                # Clear existing (UNLINK frees memory off the main thread) and write
+                # fresh in one round-trip per env (per _WARM_FLUSH_EVERY rows)
+                with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.unlink(leaderboard_key)
+                    # All members in one variadic ZADD
+                    pipe.zadd(leaderboard_key, {row.id: float(row.score) for row in rows})
+                    for i, row in enumerate(rows, 1):
+                        if i % _WARM_FLUSH_EVERY == 0:
+                            # Cap buffered commands/replies for very large envs
+                            pipe.execute()
+                        pipe.set(
+                            _submission_key(row.id),
+                            json.dumps({
+                                'user_id': row.user_id or 'Unknown',
+                                'algorithm': row.algorithm or 'Unknown',
+                                'score': float(row.score),
+                                'created_at': row.created_at.isoformat(),
+                                'created_at_ts': row.created_at.timestamp(),
+                                'env_id': row.env_id,
+                            }),
+                            ex=30*24*60*60,
+                        )
+                    pipe.expire(leaderboard_key, 30*24*60*60)
+                    pipe.unlink(_response_cache_key(env_id))
+                    # A rebuild gets a fresh, never-reused version (not INCR from 0)
+                    pipe.set(_version_key(env_id), time.time_ns(), ex=30*24*60*60)
+                    pipe.execute()
             logger.info("Redis leaderboard warmed from DB")
         except Exception as e:
             logger.error(f"Warm Redis from DB failed: {str(e)}")
@@ -120,62 +306,61 @@ class RedisLeaderboard:
                 logger.debug("db_close_failed_after_warm", extra={"error": str(e)})
     
     def add_submission(self, submission: Submission):
-        """Add submission to leaderboard when completed or failed"""
-        if not self.redis_client:
-            self.connect()
-            
+        """Add submission to leaderboard when completed or failed.
+
+        Redis only: the durable LeaderboardEntry row is committed together
+        with the submission's status (see stage_leaderboard_entry).
+        """
         if submission.score is None:
             return
             
         try:
             # Create leaderboard key for this environment
-            leaderboard_key = self.leaderboard_key.format(env_id=submission.env_id)
-            
-            # Add to sorted set (score -> submission_id)
-            self.redis_client.zadd(leaderboard_key, {submission.id: submission.score})
-            
-            # Store submission details as hash
-            submission_key = self.submission_key.format(submission_id=submission.id)
+            leaderboard_key = _leaderboard_key(submission.env_id)
+            submission_key = _submission_key(submission.id)
             submission_data = {
                 'user_id': submission.user_id,
                 'algorithm': submission.algorithm,
                 'score': submission.score,
                 'created_at': submission.created_at.isoformat(),
+                'created_at_ts': submission.created_at.timestamp(),
                 'env_id': submission.env_id
             }
-            self.redis_client.hset(submission_key, mapping=submission_data)
             
-            # Set expiration
-            self.redis_client.expire(leaderboard_key, 30*24*60*60)
-            self.redis_client.expire(submission_key, 30*24*60*60)
+            # Sorted set (score -> submission_id), details JSON and expirations
+            # go out as one MULTI/EXEC batch: one round-trip, applied atomically
+            with self.redis_client.pipeline(transaction=True) as pipe:
+                # Plain ZADD: a re-score or correction must move the rank with
+                # the stored score (the blob and DB row always take the latest)
+                pipe.zadd(leaderboard_key, {submission.id: submission.score})
+                pipe.set(submission_key, json.dumps(submission_data), ex=30*24*60*60)
+                # NX: only arms the TTL on a key that has none (new or persisted)
+                pipe.expire(leaderboard_key, 30*24*60*60, nx=True)
+                pipe.unlink(_response_cache_key(submission.env_id))
+                self._bump_version(pipe, submission.env_id)
+                pipe.publish(leaderboard_changes_channel(submission.env_id), "changed")
+                pipe.execute()
             
+            self._invalidate_pages(submission.env_id)
             logger.info(f"Added submission {submission.id} to {submission.env_id} leaderboard")
             
-            # Persist to DB table for durability
-            try:
-                db = SessionLocal()
-                entry = LeaderboardEntry(
-                    id=submission.id,
-                    submission_id=submission.id,
-                    user_id=submission.user_id,
-                    env_id=submission.env_id,
-                    algorithm=submission.algorithm,
-                    score=submission.score,
-                    created_at=submission.created_at
-                )
-                db.merge(entry)  # upsert by primary key
-                db.commit()
-            except Exception as e:
-                logger.error(f"Failed to persist leaderboard entry {submission.id}: {str(e)}")
-            finally:
-                try:
-                    db.close()
-                except Exception:
-                    pass
-            
         except Exception as e:
             logger.error(f"Failed to add submission {submission.id} to leaderboard: {str(e)}")
     
+    def _invalidate_pages(self, env_id: str):
+        """Drop this process's memoized pages for an env."""
+        with self._page_cache_lock:
+            for key in list(self._page_cache):
+                if key[0] == env_id:
+                    self._page_cache.pop(key, None)
+
+    def _remember_page(self, page_key: tuple, version: str | None, result: list):
+        """Memoize an unfiltered page; empty results (unknown env_ids) are not kept."""
+        if not result:
+            return
+        with self._page_cache_lock:
+            self._page_cache[page_key] = (version, result)
+
     def get_leaderboard(
         self,
         env_id: str,
@@ -188,78 +373,76 @@ class RedisLeaderboard:
         date_from: str | None = None,
         date_to: str | None = None,
         sort: str = "score_desc",
+        version: str | None = None,
     ):
         """Get leaderboard with filters and sorting.
 
+        version is the env's write counter read by the caller (see get_version).
+        Cached responses are only reused for the same version, so rows built
+        before a write are never served under the post-write ETag.
+
         Sort options:
         - score_desc: score desc, tie-break by created_at asc (earlier first)
         - date_desc: created_at desc (newest), tie-break by score desc
         - date_asc: created_at asc (oldest), tie-break by score desc
         """
-        if not self.redis_client:
-            self.connect()
-            
+        page_key = None
+        if (
+            not (id_query or user or algorithm or date_from or date_to)
+            and score_min is None
+            and score_max is None
+            and (sort or "score_desc").lower() == "score_desc"
+        ):
+            page_key = (env_id, limit)
+            with self._page_cache_lock:
+                hit = self._page_cache.get(page_key)
+            if hit is not None and hit[0] == version:
+                return hit[1]
+
+        cache_key = _response_cache_key(env_id)
+        cache_field = json.dumps(
+            [version, limit, id_query, user, algorithm, score_min, score_max, date_from, date_to, sort]
+        )
         try:
-            leaderboard_key = self.leaderboard_key.format(env_id=env_id)
-            # Determine global top 3 medal mapping among non-zero scores (independent of filters/sort)
-            top3_medal_map: dict[str, str] = {}
-            try:
-                # Traverse all scores from highest to lowest and pick first 3 with non-zero score
-                candidates = self.redis_client.zrevrange(leaderboard_key, 0, -1, withscores=True)
-                rank_idx = 0
-                for sid_bytes, score in (candidates or []):
-                    try:
-                        sc = float(score)
-                    except Exception:
-                        sc = None
-                    if sc is None or sc == 0.0:
-                        continue
-                    sid = sid_bytes.decode('utf-8')
-                    if rank_idx == 0:
-                        top3_medal_map[sid] = 'gold'
-                    elif rank_idx == 1:
-                        top3_medal_map[sid] = 'silver'
-                    elif rank_idx == 2:
-                        top3_medal_map[sid] = 'bronze'
-                        break
-                    rank_idx += 1
-            except Exception as e:
-                logger.debug("compute_top3_medals_failed_redis", extra={"env_id": env_id, "error": str(e)})
-                top3_medal_map = {}
-            
-            # Fetch more than requested to allow filters to reduce results
-            fetch_count = min(max(limit * 5, 200), 2000)
-            submission_ids = self.redis_client.zrevrange(
-                leaderboard_key, 0, fetch_count - 1, withscores=True
+            cached = self.redis_client.hget(cache_key, cache_field)
+            if cached is not None:
+                result = json.loads(cached)
+                if page_key is not None:
+                    self._remember_page(page_key, version, result)
+                return result
+        except Exception as e:
+            logger.debug("leaderboard_cache_read_failed", extra={"env_id": env_id, "error": str(e)})
+
+        try:
+            leaderboard_key = _leaderboard_key(env_id)
+            # Fetch more than requested only when Python-side filters or a
+            # non-score ordering can reduce/reorder results (score ranges are
+            # applied by Redis below)
+            has_filters = bool(id_query or user or algorithm or date_from or date_to) or (
+                (sort or "score_desc").lower() != "score_desc"
+            )
+            fetch_count = min(max(limit * 5, 200), 2000) if has_filters else limit
+            # Score range filters are applied by Redis (inclusive bounds)
+            score_hi, score_lo = "+inf", "-inf"
+            if score_max is not None:
+                try:
+                    score_hi = repr(float(score_max))
+                except Exception as e:
+                    logger.debug("score_max_parse_failed", extra={"score_max": score_max, "error": str(e)})
+            if score_min is not None:
+                try:
+                    score_lo = repr(float(score_min))
+                except Exception as e:
+                    logger.debug("score_min_parse_failed", extra={"score_min": score_min, "error": str(e)})
+            flat = self._top_entries(
+                keys=[leaderboard_key],
+                args=[fetch_count, _SUBMISSION_KEY_PREFIX, score_hi, score_lo, _TIE_FETCH_MAX],
             )
             
-            if not submission_ids:
+            if flat is None:
                 # Fallback to DB if Redis empty
                 try:
                     db = SessionLocal()
-                    # Compute top3 for medals via DB (global top 3 by score for env)
-                    try:
-                        # Pick top 3 with non-zero score
-                        top3_rows = (
-                            db.query(LeaderboardEntry)
-                            .filter(LeaderboardEntry.env_id == env_id)
-                            .filter(LeaderboardEntry.score.isnot(None))
-                            .filter(LeaderboardEntry.score != 0)
-                            .order_by(LeaderboardEntry.score.desc(), LeaderboardEntry.created_at.asc(), LeaderboardEntry.id.asc())
-                            .limit(3)
-                            .all()
-                        )
-                        top3_medal_map = {}
-                        for idx, r in enumerate(top3_rows):
-                            if idx == 0:
-                                top3_medal_map[r.id] = 'gold'
-                            elif idx == 1:
-                                top3_medal_map[r.id] = 'silver'
-                            elif idx == 2:
-                                top3_medal_map[r.id] = 'bronze'
-                    except Exception as e:
-                        logger.debug("compute_top3_medals_failed_db", extra={"env_id": env_id, "error": str(e)})
-                        top3_medal_map = {}
                     q = db.query(LeaderboardEntry).filter(LeaderboardEntry.env_id == env_id)
 
                     # Apply filters
@@ -326,6 +509,7 @@ class RedisLeaderboard:
                             'env_id': row.env_id,
                             'medal': medal,
                         })
+                    self._cache_response(cache_key, cache_field, result, page_key, version)
                     return result
                 except Exception as e:
                     logger.error(f"DB fallback failed for leaderboard {env_id}: {str(e)}")
@@ -338,88 +522,83 @@ class RedisLeaderboard:
                 
             # Redis path: collect entries and filter/sort in-memory
             entries = []
-            for submission_id_bytes, score in submission_ids:
-                submission_id = submission_id_bytes.decode('utf-8')
-                submission_key = self.submission_key.format(submission_id=submission_id)
-                
-                # Get submission details
-                data = self.redis_client.hgetall(submission_key)
-                if data:
-                    # Convert bytes to strings
-                    data = {k.decode('utf-8'): v.decode('utf-8') for k, v in data.items()}
-                    # Parse created_at
+            for j in range(0, len(flat), 3):
+                submission_id = flat[j]
+                blob = flat[j + 2]
+                if blob:
+                    data = json.loads(blob)
+                    # Filter/sort on the epoch timestamp; the ISO string is
+                    # passed through to the response untouched
                     created_at_raw = data.get('created_at')
+                    created_ts = data.get('created_at_ts')
+                    if created_ts is None and created_at_raw:
+                        # Entries written before created_at_ts existed
+                        try:
+                            created_ts = datetime.fromisoformat(created_at_raw).timestamp()
+                        except Exception:
+                            created_ts = None
+                    # The ZSET score is authoritative (plain ZADD: the latest write wins)
+                    score_val = float(flat[j + 1])
+                    entries.append(_Entry(
+                        submission_id,
+                        data.get('user_id', 'Unknown'),
+                        data.get('algorithm', 'Unknown'),
+                        score_val,
+                        created_at_raw,
+                        created_ts,
+                        data.get('env_id'),
+                    ))
+            
+            # Unfiltered pages skip the filter stage entirely (and were
+            # fetched with fetch_count == limit above)
+            if has_filters:
+                # Apply filters: the substring filters run as one pass that
+                # short-circuits, so a field is only lowercased for entries that
+                # survived the previous checks
+                if id_query or user or algorithm:
+                    iq = id_query.lower() if id_query else None
+                    uq = user.lower() if user else None
+                    aq = algorithm.lower() if algorithm else None
+                    entries = [
+                        e for e in entries
+                        if (iq is None or iq in (e.id or '').lower())
+                        and (uq is None or uq in (e.user_id or '').lower())
+                        and (aq is None or aq in (e.algorithm or '').lower())
+                    ]
+                if date_from:
                     try:
-                        created_dt = datetime.fromisoformat(created_at_raw)
-                    except Exception:
-                        created_dt = None
+                        df_ts = datetime.strptime(date_from, "%Y-%m-%d").timestamp()
+                        entries = [e for e in entries if (e.created_ts is not None and e.created_ts >= df_ts)]
+                    except Exception as e:
+                        logger.debug("date_from_parse_failed_entries", extra={"date_from": date_from, "error": str(e)})
+                if date_to:
                     try:
-                        score_val = float(data['score']) if data.get('score') is not None else None
-                    except Exception:
-                        score_val = None
-                    entries.append({
-                        'id': submission_id,
-                        'user_id': data.get('user_id', 'Unknown'),
-                        'algorithm': data.get('algorithm', 'Unknown'),
-                        'score': score_val,
-                        'created_at': created_dt,
-                        'env_id': data.get('env_id'),
-                    })
-            
-            # Apply filters
-            if id_query:
-                iq = id_query.lower()
-                entries = [e for e in entries if iq in (e['id'] or '').lower()]
-            if user:
-                uq = user.lower()
-                entries = [e for e in entries if uq in (e['user_id'] or '').lower()]
-            if algorithm:
-                aq = algorithm.lower()
-                entries = [e for e in entries if aq in (e['algorithm'] or '').lower()]
-            if score_min is not None:
-                try:
-                    smin = float(score_min)
-                    entries = [e for e in entries if (e['score'] is not None and e['score'] >= smin)]
-                except Exception as e:
-                    logger.debug("score_min_parse_failed", extra={"score_min": score_min, "error": str(e)})
-            if score_max is not None:
-                try:
-                    smax = float(score_max)
-                    entries = [e for e in entries if (e['score'] is not None and e['score'] <= smax)]
-                except Exception as e:
-                    logger.debug("score_max_parse_failed", extra={"score_max": score_max, "error": str(e)})
-            if date_from:
-                try:
-                    df = datetime.strptime(date_from, "%Y-%m-%d")
-                    entries = [e for e in entries if (e['created_at'] is not None and e['created_at'] >= df)]
-                except Exception as e:
-                    logger.debug("date_from_parse_failed_entries", extra={"date_from": date_from, "error": str(e)})
-            if date_to:
-                try:
-                    dt_to_val = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1) - timedelta(microseconds=1)
-                    entries = [e for e in entries if (e['created_at'] is not None and e['created_at'] <= dt_to_val)]
-                except Exception as e:
-                    logger.debug("date_to_parse_failed_entries", extra={"date_to": date_to, "error": str(e)})
+                        dt_to_ts = (datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1) - timedelta(microseconds=1)).timestamp()
+                        entries = [e for e in entries if (e.created_ts is not None and e.created_ts <= dt_to_ts)]
+                    except Exception as e:
+                        logger.debug("date_to_parse_failed_entries", extra={"date_to": date_to, "error": str(e)})
 
             # Sorting
             s = (sort or 'score_desc').lower()
             if s == 'date_desc':
                 entries.sort(key=lambda e: (
-                    -(e['created_at'].timestamp() if e['created_at'] else float('-inf')),
-                    -(e['score'] if e['score'] is not None else float('-inf')),
-                    str(e['id'])
+                    -(e.created_ts if e.created_ts is not None else float('-inf')),
+                    -(e.score if e.score is not None else float('-inf')),
+                    str(e.id)
                 ))
             elif s == 'date_asc':
                 entries.sort(key=lambda e: (
-                    (e['created_at'].timestamp() if e['created_at'] else float('inf')),
-                    -(e['score'] if e['score'] is not None else float('-inf')),
-                    str(e['id'])
+                    (e.created_ts if e.created_ts is not None else float('inf')),
+                    -(e.score if e.score is not None else float('-inf')),
+                    str(e.id)
                 ))
-            else:  # score_desc
+            elif any(a.score == b.score for a, b in zip(entries, entries[1:])):
+                # score_desc: Redis already returned score order (filters keep
+                # it); only re-sort when equal scores need the created_at tie-break
                 entries.sort(key=lambda e: (
-                    -(e['score'] if e['score'] is not None else float('-inf')),
-                    (e['created_at'] or datetime.min),
-                    str(e['id'])
+                    -(e.score if e.score is not None else float('-inf')),
+                    (e.created_ts if e.created_ts is not None else float('-inf')),
+                    str(e.id)
                 ))
 
             # Cap to limit and build response
@@ -429,11 +608,9 @@ class RedisLeaderboard:
             # Reassign medals based on the filtered/sorted results to ensure consecutive appearance
             medal_count = 0
             for i, e in enumerate(pruned):
-                created_str = e['created_at'].isoformat() if e['created_at'] else None
-                
                 # Assign medals consecutively to the first 3 valid scores in the filtered results
                 medal = None
-                if e['score'] is not None and e['score'] > 0:
+                if e.score is not None and e.score > 0:
                     if medal_count == 0:
                         medal = 'gold'
                         medal_count += 1
@@ -446,34 +623,80 @@ class RedisLeaderboard:
                 
                 result.append({
                     'rank': i + 1,
-                    'id': e['id'],
-                    'user_id': e['user_id'],
-                    'algorithm': e['algorithm'],
-                    'score': float(e['score']) if e['score'] is not None else None,
-                    'created_at': created_str,
-                    'env_id': e['env_id'],
+                    'id': e.id,
+                    'user_id': e.user_id,
+                    'algorithm': e.algorithm,
+                    'score': float(e.score) if e.score is not None else None,
+                    'created_at': e.created_at,
+                    'env_id': e.env_id,
                     'medal': medal,
                 })
+            self._cache_response(cache_key, cache_field, result, page_key, version)
             return result
             
         except Exception as e:
             logger.error(f"Failed to get leaderboard for {env_id}: {str(e)}")
             return []
+
+    def _cache_response(
+        self,
+        cache_key: str,
+        cache_field: str,
+        result: list,
+        page_key: tuple | None = None,
+        version: str | None = None,
+    ):
+        if page_key is not None:
+            self._remember_page(page_key, version, result)
+        try:
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(cache_key, cache_field, json.dumps(result))
+                # NX: later fills don't extend the window, so stale entries age out
+                pipe.expire(cache_key, _RESPONSE_CACHE_TTL_SECONDS, nx=True)
+                pipe.execute()
+        except Exception as e:
+            logger.debug("leaderboard_cache_write_failed", extra={"cache_key": cache_key, "error": str(e)})
     
+    @staticmethod
+    def _bump_version(pipe, env_id: str):
+        """Queue the version bump for a write to env_id on pipe.
+
+        Only write paths create the key: a missing one is seeded with a unique
+        value (so a flushed Redis can't replay old ETags) before the INCR, and
+        it shares the leaderboard ZSET's 30-day TTL.
+        """
+        key = _version_key(env_id)
+        pipe.set(key, time.time_ns(), nx=True)
+        pipe.incr(key)
+        pipe.expire(key, 30*24*60*60)
+
+    def get_version(self, env_id: str) -> str | None:
+        """Current write counter for env_id's leaderboard, "0" if it has none, or None if unavailable.
+
+        Read-only: env_id comes from the client, so a miss must not create keys.
+        """
+        try:
+            return self.redis_client.get(_version_key(env_id)) or "0"
+        except Exception as e:
+            logger.debug("leaderboard_version_read_failed", extra={"env_id": env_id, "error": str(e)})
+            return None
+
     def remove_submission(self, submission_id: str, env_id: str):
         """Remove submission from leaderboard"""
-        if not self.redis_client:
-            self.connect()
-            
         try:
-            leaderboard_key = self.leaderboard_key.format(env_id=env_id)
-            submission_key = self.submission_key.format(submission_id=submission_id)
+            leaderboard_key = _leaderboard_key(env_id)
+            submission_key = _submission_key(submission_id)
             
-            # Remove from sorted set
-            self.redis_client.zrem(leaderboard_key, submission_id)
-            # Remove submission details
-            self.redis_client.delete(submission_key)
+            # Remove from sorted set and drop submission details in one batch
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.zrem(leaderboard_key, submission_id)
+                pipe.unlink(submission_key)
+                pipe.unlink(_response_cache_key(env_id))
+                self._bump_version(pipe, env_id)
+                pipe.publish(leaderboard_changes_channel(env_id), "changed")
+                pipe.execute()
             
+            self._invalidate_pages(env_id)
             logger.info(f"Removed submission {submission_id} from {env_id} leaderboard")
             
         except Exception as e:
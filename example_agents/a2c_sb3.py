@@ -5,6 +5,9 @@ import gymnasium as gym
 import numpy as np
 
 from stable_baselines3 import A2C  # type: ignore
+from stable_baselines3.common.env_util import make_vec_env  # type: ignore
+from stable_baselines3.common.evaluation import evaluate_policy  # type: ignore
+from stable_baselines3.common.vec_env import DummyVecEnv  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -14,19 +17,17 @@ def run_a2c(env_id: str, timesteps: int = 10_000) -> None:
     model = A2C("MlpPolicy", env, verbose=0)
     model.learn(total_timesteps=timesteps)
 
-    metrics: list[float] = []
-    for _ in range(10):
-        obs, _ = env.reset()
-        done = False
-        ep_ret = 0.0
-        while not done:
-            action, _ = model.predict(obs, deterministic=True)
-            obs, reward, terminated, truncated, _ = env.step(action)
-            done = bool(terminated or truncated)
-            ep_ret += float(reward)
-        metrics.append(ep_ret)
     env.close()
 
+    # Evaluate the 10 episodes as one in-process batch; subprocess workers
+    # would each re-import torch under the evaluator's pid/memory limits
+    eval_env = make_vec_env(env_id, n_envs=10, vec_env_cls=DummyVecEnv)
+    episode_rewards, _ = evaluate_policy(
+        model, eval_env, n_eval_episodes=10, deterministic=True, return_episode_rewards=True
+    )
+    eval_env.close()
+    metrics: list[float] = [float(r) for r in episode_rewards]
+
     result = {"score": float(np.mean(metrics)) if metrics else 0.0, "metrics": metrics, "episodes": len(metrics)}
     print(json.dumps(result))
 
@@ -33,19 +33,27 @@ def dqn_train(env_id: str, episodes: int = 40, max_steps: int = 200) -> None:
         return
     n_actions = int(env.action_space.n)
 
-    q = QNet(obs_size, n_actions)
-    tgt = QNet(obs_size, n_actions)
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    q = QNet(obs_size, n_actions).to(device)
+    tgt = QNet(obs_size, n_actions).to(device)
     tgt.load_state_dict(q.state_dict())
     opt = optim.Adam(q.parameters(), lr=1e-3)
     gamma = 0.99
     epsilon, eps_min, eps_decay = 1.0, 0.05, 0.97
 
-    from collections import deque
-    buf = deque(maxlen=5000)
+    # Replay buffer as preallocated ring arrays (one per field), so sampling a
+    # batch is a fancy-index gather instead of stacking a list of tuples
+    capacity = 5000
+    obs_buf = np.zeros((capacity, obs_size), dtype=np.float32)
+    next_buf = np.zeros((capacity, obs_size), dtype=np.float32)
+    act_buf = np.zeros((capacity, 1), dtype=np.int64)
+    rew_buf = np.zeros((capacity, 1), dtype=np.float32)
+    done_buf = np.zeros((capacity, 1), dtype=np.float32)
+    ptr, size = 0, 0
 
     def to_tensor(obs):
         x = np.array(obs, dtype=np.float32).reshape(1, -1)
-        return torch.from_numpy(x)
+        return torch.from_numpy(x).to(device, non_blocking=True)
 
     metrics: list[float] = []
     step_count = 0
@@ -58,7 +66,7 @@ def dqn_train(env_id: str, episodes: int = 40, max_steps: int = 200) -> None:
             if np.random.rand() < epsilon:
                 act = env.action_space.sample()
             else:
-                with torch.no_grad():
+                with torch.inference_mode():
                     act = int(torch.argmax(q(to_tensor(obs))).item())
             step_out = env.step(act)
             if len(step_out) >= 5:
@@ -66,19 +74,23 @@ def dqn_train(env_id: str, episodes: int = 40, max_steps: int = 200) -> None:
                 done = bool(terminated or truncated)
             else:
                 next_obs, rew, done, _info = step_out
-            buf.append((obs, act, rew, next_obs, done))
+            obs_buf[ptr] = np.asarray(obs, dtype=np.float32).reshape(-1)
+            next_buf[ptr] = np.asarray(next_obs, dtype=np.float32).reshape(-1)
+            act_buf[ptr] = act
+            rew_buf[ptr] = rew
+            done_buf[ptr] = done
+            ptr = (ptr + 1) % capacity
+            size = min(size + 1, capacity)
             ep_ret += float(rew)
             obs = next_obs
 
-            if len(buf) >= 512:
-                import random
-                batch = random.sample(buf, 64)
-                ob, ac, rw, nb, dn = zip(*batch)
-                ob_t = torch.from_numpy(np.array(ob, dtype=np.float32))
-                nb_t = torch.from_numpy(np.array(nb, dtype=np.float32))
-                ac_t = torch.tensor(ac, dtype=torch.long).view(-1, 1)
-                rw_t = torch.tensor(rw, dtype=torch.float32).view(-1, 1)
-                dn_t = torch.tensor(dn, dtype=torch.float32).view(-1, 1)
+            if size >= 512:
+                idx = np.random.randint(0, size, 64)
+                ob_t = torch.from_numpy(obs_buf[idx]).to(device, non_blocking=True)
+                nb_t = torch.from_numpy(next_buf[idx]).to(device, non_blocking=True)
+                ac_t = torch.from_numpy(act_buf[idx]).to(device, non_blocking=True)
+                rw_t = torch.from_numpy(rew_buf[idx]).to(device, non_blocking=True)
+                dn_t = torch.from_numpy(done_buf[idx]).to(device, non_blocking=True)
 
                 q_pred = q(ob_t).gather(1, ac_t)
                 with torch.no_grad():
@@ -5,8 +5,44 @@ import sys
 import json
 import logging
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 logger = logging.getLogger(__name__)
 
+
+@njit(fastmath=True)
+def greedy_action(q_table, state):
+    """argmax over q_table[state] (first index wins ties, like np.argmax)."""
+    best_action = 0
+    best_value = q_table[state, 0]
+    for a in range(1, q_table.shape[1]):
+        if q_table[state, a] > best_value:
+            best_value = q_table[state, a]
+            best_action = a
+    return best_action
+
+
+@njit(fastmath=True)
+def q_update_batch(q_table, states, actions, rewards, next_states, terminated, n, alpha, gamma):
+    """In-place Q-learning updates for the first n recorded transitions, in order."""
+    for i in range(n):
+        next_max = 0.0
+        if not terminated[i]:
+            next_max = q_table[next_states[i], 0]
+            for a in range(1, q_table.shape[1]):
+                if q_table[next_states[i], a] > next_max:
+                    next_max = q_table[next_states[i], a]
+        s, act = states[i], actions[i]
+        q_table[s, act] = (1 - alpha) * q_table[s, act] + alpha * (rewards[i] + gamma * next_max)
+
+
 def train_dqn(env_id=None, episodes=200, max_steps=100):
     # For FrozenLake, use deterministic dynamics for faster convergence
     env_kwargs = {}
@@ -21,53 +57,65 @@ def train_dqn(env_id=None, episodes=200, max_steps=100):
     
     # Initialize Q-table
     state_size = int(env.observation_space.n)
-    q_table = np.zeros([state_size, env.action_space.n])
+    q_table = np.zeros((state_size, env.action_space.n), dtype=np.float32)
     
     # Hyperparameters
-    alpha = 0.1
-    gamma = 0.95
+    # float32 like the Q-table so updates don't upcast rows to float64
+    alpha = np.float32(0.1)
+    gamma = np.float32(0.95)
     epsilon = 1.0
     min_epsilon = 0.05
     decay = 0.995
     logger.info(f"state_size={state_size} action_space={env.action_space.n} is_slippery={env_kwargs.get('is_slippery', 'default')}")
+
+    # Transitions are recorded into preallocated arrays and applied in one
+    # batch at the end of each episode
+    n_actions = int(env.action_space.n)
+    S = np.empty(max_steps, dtype=np.int64)
+    A = np.empty_like(S)
+    R = np.empty(max_steps, dtype=np.float32)
+    Sp = np.empty_like(S)
+    T = np.empty(max_steps, dtype=np.bool_)
+    rng = np.random.default_rng()
+
     # Training
     metrics = []
     for i in range(episodes):
-        state = env.reset()
-        if isinstance(state, tuple):
-            state = state[0]
-        state = int(state)
+        # Gymnasium's reset/step signatures are fixed, so unpack directly
+        state = int(env.reset()[0])
 
         done = False
         total_reward = 0
+        # Exploration draws for the whole episode at once
+        coins = rng.random(max_steps)
+        random_actions = rng.integers(0, n_actions, max_steps)
 
+        n = 0
         for t in range(max_steps):
             # Epsilon-greedy action selection
-            if np.random.uniform(0, 1) < epsilon:
-                action = env.action_space.sample()
+            if coins[t] < epsilon:
+                action = int(random_actions[t])
             else:
-                action = np.argmax(q_table[state])
+                action = greedy_action(q_table, state)
             
-            # Take action (Gym 0.26+: obs, reward, terminated, truncated, info)
-            step_out = env.step(action)
-            next_state, reward, terminated, truncated, info = step_out[0], step_out[1], step_out[2], step_out[3], step_out[4] if len(step_out) > 4 else ({})
-            done = bool(terminated or truncated)
-            if isinstance(next_state, tuple):
-                next_state = next_state[0]
+            # Take action (Gymnasium: obs, reward, terminated, truncated, info)
+            next_state, reward, terminated, truncated, _ = env.step(action)
+            done = terminated or truncated
             next_state = int(next_state)
 
             total_reward += reward
             
-            # Update Q-table
-            old_value = q_table[state, action]
-            next_max = np.max(q_table[next_state])
-            new_value = (1 - alpha) * old_value + alpha * (reward + gamma * next_max)
-            q_table[state, action] = new_value
+            S[n], A[n], R[n], Sp[n], T[n] = state, action, reward, next_state, terminated
+            n += 1
             
             state = next_state
             if done:
                 break
 
+        # Update Q-table in order (JIT-compiled when numba is available, plain
+        # Python otherwise; both give the same result)
+        q_update_batch(q_table, S, A, R, Sp, T, n, alpha, gamma)
+
         epsilon = max(min_epsilon, epsilon * decay)
         logger.info(f"episode={i} reward={total_reward:.2f} epsilon={epsilon:.3f}")
         metrics.append(total_reward)
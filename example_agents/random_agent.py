@@ -2,6 +2,7 @@ import sys
 import json
 import logging
 import gymnasium as gym
+import numpy as np
 import torch 
 logger = logging.getLogger(__name__)
 
@@ -10,34 +11,26 @@ def run_random_policy(env_id: str, episodes: int = 10, max_steps: int = 500) ->
     """Run a random policy for a few episodes and report average reward.
 
     Works for both discrete and continuous action spaces by sampling from
-    env.action_space each step.
+    the batched action_space each step. Episodes are stepped together as one
+    batch, each capped at max_steps.
     """
-    env = gym.make(env_id)
-    metrics: list[float] = []
-
-    for _ in range(episodes):
-        reset_out = env.reset()
-        observation = reset_out[0] if isinstance(reset_out, tuple) else reset_out
-        done = False
-        episode_reward = 0.0
-
-        for _ in range(max_steps):
-            action = env.action_space.sample()
-            step_out = env.step(action)
-            if len(step_out) >= 5:
-                next_obs, reward, terminated, truncated, _info = step_out
-                done = bool(terminated or truncated)
-            else:
-                # Gym pre-0.26 style
-                next_obs, reward, done, _info = step_out
-            observation = next_obs
-            episode_reward += float(reward)
-            if done:
-                break
-
-        metrics.append(episode_reward)
-
-    env.close()
+    # One sub-env per episode, batched in-process (worker processes would
+    # re-import numpy/torch under the evaluator's pid/memory limits)
+    envs = gym.vector.SyncVectorEnv([lambda: gym.make(env_id) for _ in range(episodes)])
+    envs.reset()
+    returns = np.zeros(episodes, dtype=np.float64)
+    active = np.ones(episodes, dtype=bool)
+
+    for _ in range(max_steps):
+        _obs, rewards, terminated, truncated, _info = envs.step(envs.action_space.sample())
+        # Sub-envs auto-reset after finishing; only count each one's first episode
+        returns += np.where(active, rewards, 0.0)
+        active &= ~(terminated | truncated)
+        if not active.any():
+            break
+
+    envs.close()
+    metrics: list[float] = [float(r) for r in returns]
 
     result = {
         "score": (sum(metrics) / len(metrics)) if metrics else 0.0,
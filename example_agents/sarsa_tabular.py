@@ -4,72 +4,226 @@ import logging
 import numpy as np
 import gymnasium as gym
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 logger = logging.getLogger(__name__)
 
 
-def run_sarsa(env_id: str, episodes: int = 400, max_steps: int = 200) -> None:
+@njit(fastmath=True)
+def sarsa_update(Q, s, a, r, s_next, a_next, done, live, alpha, gamma):
+    """In-place SARSA updates for one batch of transitions, applied in order."""
+    for i in range(s.shape[0]):
+        if not live[i]:
+            continue
+        target = r[i]
+        if not done[i]:
+            target += gamma * Q[s_next[i], a_next[i]]
+        Q[s[i], a[i]] += alpha * (target - Q[s[i], a[i]])
+
+
+@njit
+def _epsilon_greedy(Q, state, epsilon):
+    if np.random.random() < epsilon:
+        return np.random.randint(Q.shape[1])
+    return np.argmax(Q[state])
+
+
+@njit
+def roll(next_s, reward, done_tbl, Q, start, episodes, max_steps, alpha, gamma, eps0, eps_min, eps_decay, seed):
+    """Full SARSA training against a deterministic transition table; returns per-episode returns."""
+    np.random.seed(seed)
+    metrics = np.zeros(episodes, dtype=np.float32)
+    epsilon = eps0
+    for ep in range(episodes):
+        s = start
+        a = _epsilon_greedy(Q, s, epsilon)
+        total = np.float32(0.0)
+        for t in range(max_steps):
+            s2 = next_s[s, a]
+            r = reward[s, a]
+            total += r
+            done = done_tbl[s, a] or t == max_steps - 1
+            a2 = _epsilon_greedy(Q, s2, epsilon)
+            target = r
+            if not done:
+                target += gamma * Q[s2, a2]
+            Q[s, a] += alpha * (target - Q[s, a])
+            if done:
+                break
+            s, a = s2, a2
+        metrics[ep] = total
+        epsilon = max(eps_min, epsilon * eps_decay)
+    return metrics
+
+
+def _deterministic_tables(env):
+    """Read (next_s, reward, done) arrays from a toy-text env's P table, or None if it is stochastic."""
+    P = getattr(env.unwrapped, "P", None)
+    if P is None:
+        return None
+    n_obs = int(env.observation_space.n)
+    n_act = int(env.action_space.n)
+    next_s = np.zeros((n_obs, n_act), dtype=np.int64)
+    reward = np.zeros((n_obs, n_act), dtype=np.float32)
+    done_tbl = np.zeros((n_obs, n_act), dtype=np.bool_)
+    for s in range(n_obs):
+        for a in range(n_act):
+            outcomes = P[s][a]
+            if len(outcomes) != 1:
+                return None
+            _prob, s2, r, done = outcomes[0]
+            next_s[s, a] = s2
+            reward[s, a] = r
+            done_tbl[s, a] = done
+    return next_s, reward, done_tbl
+
+
+def run_sarsa(env_id: str, episodes: int = 400, max_steps: int = 200, num_envs: int = 8) -> None:
+    rng = np.random.default_rng()
     env_kwargs = {}
     if str(env_id).startswith("FrozenLake"):
         env_kwargs["is_slippery"] = False
-    env = gym.make(env_id, **env_kwargs)
-
-    if not hasattr(env.action_space, "n") or not hasattr(env.observation_space, "n"):
+        # Non-slippery FrozenLake is a pure table lookup: train fully compiled, no gym.step
+        probe = gym.make(env_id, **env_kwargs)
+        tables = _deterministic_tables(probe)
+        if tables is not None:
+            start, _info = probe.reset()
+            limit = probe.spec.max_episode_steps if probe.spec and probe.spec.max_episode_steps else max_steps
+            probe.close()
+            Q = np.zeros(tables[0].shape, dtype=np.float32)
+            metrics = roll(*tables, Q, int(start), episodes, min(max_steps, limit),
+                           np.float32(0.1), np.float32(0.99), 1.0, 0.05, 0.995, int(rng.integers(2**31 - 1)))
+            print(json.dumps({
+                "score": float(np.mean(metrics)) if len(metrics) else 0.0,
+                "metrics": metrics.tolist(),
+                "episodes": episodes,
+            }))
+            return
+        probe.close()
+
+    def make_env():
+        # max_steps caps each episode (as truncation) inside every sub-env
+        return gym.wrappers.TimeLimit(gym.make(env_id, **env_kwargs), max_episode_steps=max_steps)
+
+    # Validate spaces on a single env before building the vector env
+    probe = gym.make(env_id, **env_kwargs)
+    discrete = hasattr(probe.action_space, "n") and hasattr(probe.observation_space, "n")
+    probe.close()
+    if not discrete:
         print(json.dumps({"error": "SARSA example supports discrete observation and action spaces"}))
         return
 
-    n_obs = int(env.observation_space.n)
-    n_act = int(env.action_space.n)
+    # num_envs copies stepped together: one batched SARSA update per tick.
+    # Tabular (discrete-observation) envs step in microseconds, so they are
+    # stepped in-process; subprocess workers would cost more than they save.
+    env = gym.vector.SyncVectorEnv([make_env for _ in range(num_envs)])
+
+    n_obs = int(env.single_observation_space.n)
+    n_act = int(env.single_action_space.n)
     Q = np.zeros((n_obs, n_act), dtype=np.float32)
 
-    alpha = 0.1
-    gamma = 0.99
+    # float32 like Q, so updates never round-trip through float64
+    alpha = np.float32(0.1)
+    gamma = np.float32(0.99)
     epsilon = 1.0
     epsilon_min = 0.05
     epsilon_decay = 0.995
 
-    metrics: list[float] = []
-    for _ in range(episodes):
-        s0 = env.reset()
-        s = s0[0] if isinstance(s0, tuple) else s0
-        s = int(s)
-        # Choose initial action
-        if np.random.rand() < epsilon:
-            a = env.action_space.sample()
-        else:
-            a = int(np.argmax(Q[s]))
-
-        ep_ret = 0.0
-        for _ in range(max_steps):
-            step_out = env.step(a)
-            if len(step_out) >= 5:
-                s_next, r, terminated, truncated, _info = step_out
-                done = bool(terminated or truncated)
-            else:
-                s_next, r, done, _info = step_out
-            s_next = int(s_next if not isinstance(s_next, tuple) else s_next[0])
-            ep_ret += float(r)
-
-            # Next action (epsilon greedy)
-            if np.random.rand() < epsilon:
-                a_next = env.action_space.sample()
-            else:
-                a_next = int(np.argmax(Q[s_next]))
-
-            # SARSA update
-            td_target = float(r) + gamma * Q[s_next, a_next] * (0.0 if done else 1.0)
-            Q[s, a] += alpha * (td_target - Q[s, a])
-
-            s, a = s_next, a_next
-            if done:
-                break
-
-        epsilon = max(epsilon_min, epsilon * epsilon_decay)
-        metrics.append(ep_ret)
-
+    # Gymnasium >= 1.0 resets a finished sub-env on the *next* step() (that
+    # step's action is ignored and its reward is 0); older versions reset in
+    # the same step. Track which sub-envs are mid-reset so they are skipped.
+    next_step_reset = "NEXT_STEP" in str(env.metadata.get("autoreset_mode", ""))
+
+    # Exploration coins and random actions are drawn max_steps ticks at a time
+    draws = {"coins": None, "ract": None, "i": max_steps}
+
+    # Greedy policy per state. Q only changes in flush(), so refreshing the
+    # touched rows there keeps pi exact without an argmax per step.
+    pi = Q.argmax(axis=1)
+
+    # Hot-loop attribute lookups bound once
+    step = env.step
+    where = np.where
+    flatnonzero = np.flatnonzero
+
+    def choose(states):
+        # Batched epsilon-greedy
+        if draws["i"] == max_steps:
+            draws["coins"] = rng.random((max_steps, num_envs))
+            draws["ract"] = rng.integers(0, n_act, size=(max_steps, num_envs))
+            draws["i"] = 0
+        i = draws["i"]
+        draws["i"] = i + 1
+        return where(draws["coins"][i] < epsilon, draws["ract"][i], pi[states])
+
+    # Transitions are buffered for `rollout_len` ticks and applied in one
+    # batch; kept short because SARSA is on-policy.
+    rollout_len = 4
+    # Sequential, so repeated (s, a) pairs in a batch compound exactly as
+    # per-step SARSA would (plain Python when numba is missing)
+    update = sarsa_update
+    buf_s = np.zeros((rollout_len, num_envs), dtype=np.int64)
+    buf_a = np.zeros_like(buf_s)
+    buf_sn = np.zeros_like(buf_s)
+    buf_an = np.zeros_like(buf_s)
+    buf_r = np.zeros((rollout_len, num_envs), dtype=np.float32)
+    buf_done = np.zeros((rollout_len, num_envs), dtype=bool)
+    buf_live = np.zeros((rollout_len, num_envs), dtype=bool)
+    k = 0
+
+    def flush(n):
+        update(Q, buf_s[:n].ravel(), buf_a[:n].ravel(), buf_r[:n].ravel(), buf_sn[:n].ravel(),
+               buf_an[:n].ravel(), buf_done[:n].ravel(), buf_live[:n].ravel(), alpha, gamma)
+        # Only the updated rows can change their greedy action
+        rows = np.unique(buf_s[:n])
+        pi[rows] = Q[rows].argmax(axis=1)
+
+    s, _info = env.reset()
+    s = s.astype(np.int64)
+    a = choose(s)
+    ep_ret = np.zeros(num_envs, dtype=np.float32)
+    resetting = np.zeros(num_envs, dtype=bool)
+
+    metrics = np.empty(episodes, dtype=np.float32)
+    n_done = 0
+    while n_done < episodes:
+        s_next, r, terminated, truncated, _info = step(a)
+        s_next = s_next.astype(np.int64)
+        done = terminated | truncated
+        a_next = choose(s_next)
+
+        live = ~resetting
+        buf_s[k], buf_a[k], buf_r[k], buf_sn[k], buf_an[k] = s, a, r, s_next, a_next
+        buf_done[k], buf_live[k] = done, live
+        k += 1
+        if k == rollout_len:
+            flush(k)
+            k = 0
+        ep_ret += where(live, r, 0.0)
+
+        for i in flatnonzero(done & live):
+            if n_done < episodes:
+                metrics[n_done] = ep_ret[i]
+                n_done += 1
+            ep_ret[i] = 0.0
+            epsilon = max(epsilon_min, epsilon * epsilon_decay)
+
+        resetting = (done & live) if next_step_reset else resetting
+        s, a = s_next, a_next
+
+    if k:
+        flush(k)
     env.close()
     result = {
-        "score": float(np.mean(metrics)) if metrics else 0.0,
-        "metrics": metrics,
+        "score": float(metrics.mean()) if episodes else 0.0,
+        "metrics": metrics.tolist(),
         "episodes": episodes,
     }
     print(json.dumps(result))
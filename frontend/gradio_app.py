@@ -1,11 +1,22 @@
 # from app.core.docker import logger
 import gradio as gr
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import functools
+import asyncio
 import json
+import html
+import uuid
 from datetime import datetime, timezone
 import os
 import logging
+try:
+    import orjson
+except Exception:  # optional; stdlib json works, just slower
+    orjson = None
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 PORT = int(os.getenv("PORT", "7860"))
 # Public site URL for SEO; uses environment variable or defaults to Render URL
@@ -14,64 +25,220 @@ GITHUB_URL = "https://github.com/YuvrajSingh-mist/RL-Eval-Leaderboard"
 _last_submission_id = None
 logger = logging.getLogger(__name__)
 
+# Pooled keep-alive session for the remaining synchronous calls (env discovery)
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+# (connect, read) timeout for API calls
+_TIMEOUT = (3, 10)
+
+# Environment list rarely changes; reuse it briefly across page loads
+_ENVS_CACHE_TTL_SECONDS = 30.0
+_ENVS_CACHE = {"t": 0.0, "v": None}
+
+# Submit / leaderboard / status handlers are async so Gradio workers don't
+# block on backend latency; they share one aiohttp session.
+_AIO_SESSION = None
+
+# Stale-while-revalidate cache of rendered leaderboards keyed by query params,
+# so every open tab's 30s auto-refresh doesn't each hit the API.
+_LB_FRESH_SECONDS = 10.0
+_LB_STALE_SECONDS = 60.0
+_LB_CACHE = {}
+_LB_REFRESHING = {}
+
+# Scores of completed submissions seen on fetched leaderboards, by ID, so
+# check_status can skip /api/results/ for them. Failed evaluations are
+# ranked with a sentinel score and are excluded.
+_FAILED_SCORE = -1000000.0
+_SEEN_COMPLETED = {}
+
+# Leaderboard rows per "page" and the API's hard cap on limit
+_LB_PAGE_SIZE = 25
+_LB_MAX_ROWS = 500
+_AIO_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3)
+_AIO_SUBMIT_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=3)
+
+
+async def get_session():
+    """Shared aiohttp session, created lazily inside Gradio's running event loop."""
+    global _AIO_SESSION
+    if _AIO_SESSION is None or _AIO_SESSION.closed:
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=16, keepalive_timeout=60)
+        _AIO_SESSION = aiohttp.ClientSession(connector=connector)
+    return _AIO_SESSION
+
 
     
-def submit_script(file, env_id, algorithm, user_id):
+async def submit_script(file, env_id, algorithm, user_id):
     # Single-file only
     if not file:
         return "⚠️ Please upload a Python script (.py)"
 
     try:
-        import uuid as _uuid
-        client_id = str(_uuid.uuid4())
+        client_id = str(uuid.uuid4())
 
         # Single-file path only
         if not str(file.name).lower().endswith('.py'):
             return "⚠️ Only .py files are accepted"
-        submit_files = {'file': (file.name, open(file.name, 'rb'), 'text/plain')}
-        data = {
-            'env_id': env_id,
-            'algorithm': algorithm,
-            'user_id': user_id or "anonymous",
-            'client_id': client_id
-        }
 
-        response = requests.post(f"{API_URL}/api/submit/", files=submit_files, data=data)
-        
-        if response.status_code == 200:
-            result = response.json()
-            # Persist locally for Check Status tab (until refresh)
-            global _last_submission_id
-            _last_submission_id = result.get('id', client_id)
-            sid = _last_submission_id
-            html = f"""
-            <div class=\"status-box success\">
-              <div class=\"status-header\">
-                <span>✅</span>
-                <span>Submission queued</span>
-                <span class=\"status-pill\">Waiting to evaluate</span>
-              </div>
-              <div class=\"status-id\">
-                <b>ID:</b> <code>{sid}</code>
-                <button class=\"copy-btn\" onclick=\"navigator.clipboard.writeText('{sid}'); this.innerText='Copied'; setTimeout(()=>{{ this.innerText='Copy ID'; }}, 1600);\">Copy ID</button>
-              </div>
-              <div class=\"status-kv\">
-                <div class=\"label\">Environment</div><div class=\"value\">{result['env_id']}</div>
-                <div class=\"label\">Algorithm</div><div class=\"value\">{result['algorithm']}</div>
-              </div>
-              <div class=\"status-foot\"><b>Keep your Submission ID safe!</b> You'll need it in the <i>Check Status</i> tab to view progress and error logs.</div>
-            </div>
-            """
-            return html
-        else:
-            error_detail = response.json().get('detail', 'Unknown error')
-            return f"❌ Error {response.status_code}: {error_detail}"
-            
+        # Await the API's verdict so rejections (bad file, oversize, 4xx) are
+        # shown here; evaluation itself is followed via Check Status
+        session = await get_session()
+        with open(file.name, 'rb') as fh:
+            # Stream the multipart body from disk instead of building it in memory
+            form = aiohttp.FormData()
+            form.add_field('file', fh, filename=os.path.basename(file.name), content_type='text/plain')
+            form.add_field('env_id', env_id)
+            form.add_field('algorithm', algorithm)
+            form.add_field('user_id', user_id or "anonymous")
+            form.add_field('client_id', client_id)
+            async with session.post(f"{API_URL}/api/submit/", data=form, timeout=_AIO_SUBMIT_TIMEOUT) as response:
+                status_code = response.status
+                try:
+                    result = _json_loads(await response.read()) or {}
+                except Exception:
+                    result = {}
+
+        if status_code != 200:
+            error_detail = result.get('detail', 'Unknown error') if isinstance(result, dict) else 'Unknown error'
+            return f"❌ Error {status_code}: {html.escape(str(error_detail))}"
+
+        # Persist locally for Check Status tab (until refresh)
+        global _last_submission_id
+        _last_submission_id = result.get('id', client_id)
+        sid = html.escape(str(_last_submission_id))
+        status_html = f"""
+        <div class=\"status-box success\">
+          <div class=\"status-header\">
+            <span>✅</span>
+            <span>Submission queued</span>
+            <span class=\"status-pill\">Waiting to evaluate</span>
+          </div>
+          <div class=\"status-id\">
+            <b>ID:</b> <code>{sid}</code>
+            <button class=\"copy-btn\" onclick=\"navigator.clipboard.writeText('{sid}'); this.innerText='Copied'; setTimeout(()=>{{ this.innerText='Copy ID'; }}, 1600);\">Copy ID</button>
+          </div>
+          <div class=\"status-kv\">
+            <div class=\"label\">Environment</div><div class=\"value\">{html.escape(str(env_id))}</div>
+            <div class=\"label\">Algorithm</div><div class=\"value\">{html.escape(str(algorithm))}</div>
+          </div>
+          <div class=\"status-foot\"><b>Keep your Submission ID safe!</b> You'll need it in the <i>Check Status</i> tab to view progress and error logs.</div>
+        </div>
+        """
+        return status_html
+
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def get_leaderboard(env_id, id_query, user_query, algorithm_query, score_min, score_max, sort_order):
-    """Fetch leaderboard from API using server-side filters/sorting and render rows."""
+_UTC = timezone.utc
+_json_loads = orjson.loads if orjson is not None else json.loads
+_MEDAL_ICONS = {"gold": "🥇 ", "silver": "🥈 ", "bronze": "🥉 "}
+
+
+def _pretty_created_at(created_at):
+    """ISO timestamp from the API -> 'YYYY-MM-DD HH:MM' in UTC, or '-'."""
+    if not isinstance(created_at, str):
+        return "-"
+    return _fmt_created_at(created_at)
+
+
+# Rows recur across refreshes, so the pure parse/format step is memoized
+@functools.lru_cache(maxsize=4096)
+def _fmt_created_at(created_at):
+    try:
+        if created_at.endswith("Z"):
+            created_at = created_at[:-1] + "+00:00"
+        dtv = datetime.fromisoformat(created_at)
+    except ValueError:
+        return "-"
+    # The API emits naive UTC; only convert when an offset is present
+    if dtv.tzinfo is not None:
+        dtv = dtv.astimezone(_UTC)
+    return f"{dtv.year:04d}-{dtv.month:02d}-{dtv.day:02d} {dtv.hour:02d}:{dtv.minute:02d}"
+
+_LEADERBOARD_HEADERS = ("Rank", "Submission ID", "User", "Score", "Algorithm", "Date (in UTC)")
+_LEADERBOARD_THEAD = "<thead><tr>" + "".join(f"<th>{h}</th>" for h in _LEADERBOARD_HEADERS) + "</tr></thead>"
+
+
+def _render_leaderboard(rows):
+    """Render leaderboard rows as one HTML table string (one gr.HTML update per refresh)."""
+    fragments = []
+    for row in rows:
+        cells = "".join(
+            f"<td>{html.escape('' if v is None else str(v))}</td>" for v in row
+        )
+        fragments.append(f"<tr>{cells}</tr>")
+    return f"<table>{_LEADERBOARD_THEAD}<tbody>{''.join(fragments)}</tbody></table>"
+
+async def _fetch_leaderboard(key, params):
+    """GET /api/leaderboard/ and render it; successful renders are cached under key."""
+    session = await get_session()
+    # aiohttp only accepts str/int query values
+    query = {k: str(v) for k, v in params.items()}
+    # Conditional GET: a 304 means the rendered table is still current
+    cached = _LB_CACHE.get(key)
+    headers = {"If-None-Match": cached[2]} if cached is not None and cached[2] else None
+    async with session.get(f"{API_URL}/api/leaderboard/", params=query, headers=headers, timeout=_AIO_TIMEOUT) as response:
+        if response.status == 304 and cached is not None:
+            _LB_CACHE[key] = (time.monotonic(), cached[1], cached[2])
+            return cached[1]
+        if response.status != 200:
+            return _render_leaderboard([["Error", "-", f"Failed: {response.status}", None, "-", "-"]])
+        etag = response.headers.get("ETag")
+        entries = _json_loads(await response.read()) or []
+    if not entries:
+        return _render_leaderboard([[None, "-", "No submissions yet", None, "-", "-"]])
+
+    for e in entries:
+        sc = e.get("score")
+        if isinstance(sc, (int, float)) and sc > _FAILED_SCORE and e.get("id"):
+            _SEEN_COMPLETED[e["id"]] = float(sc)
+    while len(_SEEN_COMPLETED) > 5000:
+        _SEEN_COMPLETED.pop(next(iter(_SEEN_COMPLETED)))
+
+    # Build table rows as returned by server (already sorted/ranked)
+    table = [
+        [
+            f"{_MEDAL_ICONS.get(str(e.get('medal') or '').lower(), '')}{rank}" if (rank := e.get("rank")) is not None else "-",
+            e.get("id", ""),
+            e.get("user_id", "Unknown"),
+            float(sc) if isinstance(sc := e.get("score"), (int, float)) else None,
+            e.get("algorithm", "Unknown"),
+            _pretty_created_at(e.get("created_at")),
+        ]
+        for e in entries
+    ]
+    rendered = _render_leaderboard(table)
+    now = time.monotonic()
+    if len(_LB_CACHE) >= 256:
+        # Filter text makes keys unbounded; drop anything past the stale window
+        for k in [k for k, v in _LB_CACHE.items() if now - v[0] >= _LB_STALE_SECONDS]:
+            del _LB_CACHE[k]
+    _LB_CACHE[key] = (now, rendered, etag)
+    return rendered
+
+
+async def _refresh_leaderboard(key, params):
+    try:
+        await _fetch_leaderboard(key, params)
+    except Exception:
+        logger.exception("Background leaderboard refresh failed")
+    finally:
+        _LB_REFRESHING.pop(key, None)
+
+
+async def get_leaderboard(env_id, id_query, user_query, algorithm_query, score_min, score_max, sort_order, limit=None, force=False):
+    """Fetch leaderboard from API using server-side filters/sorting and render rows.
+
+    force skips the fresh/stale windows (still a cheap conditional GET); used
+    for explicit clicks and push-driven refreshes so a new result shows at once.
+    """
     try:
         # Map UI sort order to API sort values
         sort_map = {
@@ -97,7 +264,10 @@ def get_leaderboard(env_id, id_query, user_query, algorithm_query, score_min, sc
             except Exception:
                 return None
 
-        params = {"env_id": env_id, "limit": 200, "sort": sort}
+        # First paint is one page; "Load more" grows the limit (ranks/medals
+        # stay consistent because the server ranks the whole prefix)
+        page_limit = min(int(limit or _LB_PAGE_SIZE), _LB_MAX_ROWS)
+        params = {"env_id": env_id, "limit": page_limit, "sort": sort}
         if id_query:
             params["id_query"] = str(id_query).strip()
         if user_query:
@@ -116,50 +286,34 @@ def get_leaderboard(env_id, id_query, user_query, algorithm_query, score_min, sc
                 pass
         # Dates removed per request
 
-        response = requests.get(f"{API_URL}/api/leaderboard/", params=params)
-        if response.status_code != 200:
-            return [["Error", "-", f"Failed: {response.status_code}", None, "-", "-"]]
+        key = tuple(sorted(params.items()))
+        cached = None if force else _LB_CACHE.get(key)
+        if cached is not None:
+            age = time.monotonic() - cached[0]
+            if age < _LB_FRESH_SECONDS:
+                return cached[1]
+            if age < _LB_STALE_SECONDS:
+                # Serve stale and revalidate once in the background
+                if key not in _LB_REFRESHING:
+                    _LB_REFRESHING[key] = asyncio.get_running_loop().create_task(_refresh_leaderboard(key, params))
+                return cached[1]
+        return await _fetch_leaderboard(key, params)
+    except Exception as e:
+        return _render_leaderboard([["Error", "-", str(e), None, "-", "-"]])
 
-        entries = response.json() or []
-        if not entries:
-            return [[None, "-", "No submissions yet", None, "-", "-"]]
 
-        # Build table rows as returned by server (already sorted/ranked)
-        table = []
-        for e in entries:
-            try:
-                created_at = e.get("created_at")
-                dtv = datetime.fromisoformat(created_at.replace("Z", "+00:00")).astimezone(timezone.utc).replace(tzinfo=None) if isinstance(created_at, str) else None
-            except Exception:
-                dtv = None
-            pretty_dt = dtv.strftime("%Y-%m-%d %H:%M") if dtv else "-"
-            score_val = e.get("score")
-            score_num = float(score_val) if isinstance(score_val, (int, float)) else None
-
-            rank_val = e.get("rank", None)
-            medal_field = str(e.get("medal", "" ) or "").lower()
-            medal_icon = ""
-            if medal_field == "gold":
-                medal_icon = "🥇 "
-            elif medal_field == "silver":
-                medal_icon = "🥈 "
-            elif medal_field == "bronze":
-                medal_icon = "🥉 "
-            rank_str = f"{medal_icon}{rank_val}" if rank_val is not None else "-"
-
-            table.append([
-                rank_str,
-                e.get("id", ""),
-                e.get("user_id", "Unknown"),
-                score_num,
-                e.get("algorithm", "Unknown"),
-                pretty_dt,
-            ])
-        return table
-    except Exception as e:
-        return [["Error", "-", str(e), None, "-", "-"]]
+async def refresh_leaderboard(env_id, id_query, user_query, algorithm_query, score_min, score_max, sort_order, limit=None):
+    """Refresh button / change-event handler: always revalidate with the API."""
+    return await get_leaderboard(env_id, id_query, user_query, algorithm_query, score_min, score_max, sort_order, limit, force=True)
+
+# In-flight statuses whose message has no per-submission fields besides the ID
+_STATUS_STATIC = {
+    "processing": ("⚙️", "Currently evaluating"),
+    "pending": ("⏳", "Queued for evaluation"),
+}
 
-def check_status(submission_id):
+
+async def check_status(submission_id):
     """Check the status of a submission"""
     if not submission_id:
         # Use last submission id if user left input empty
@@ -168,100 +322,59 @@ def check_status(submission_id):
             submission_id = _last_submission_id
         else:
             return "🔍 Please enter a submission ID", "N/A"
+
+    submission_id = str(submission_id).strip()
+
+    # Completed is terminal, so an ID already seen on a fetched leaderboard
+    # can be answered locally. Failed runs (sentinel score) still go to the
+    # API so their error text is shown.
+    seen_score = _SEEN_COMPLETED.get(submission_id)
+    if seen_score is not None:
+        return f"✅ Completed\nID: {html.escape(submission_id)}\nScore: {seen_score:.2f}", f"{seen_score:.2f}"
     
     try:
-        response = requests.get(f"{API_URL}/api/results/{submission_id}")
+        session = await get_session()
+        async with session.get(f"{API_URL}/api/results/{submission_id}", timeout=_AIO_TIMEOUT) as response:
+            status_code = response.status
+            result = await response.json(content_type=None)
         
-        if response.status_code != 200:
-            return f"❌ Error {response.status_code}: {response.json().get('detail', 'Unknown error')}", None
+        if status_code != 200:
+            return f"❌ Error {status_code}: {result.get('detail', 'Unknown error')}", None
         
-        result = response.json()
         status = str(result.get('status', 'unknown'))
         score_val = result.get('score', None)
         score_num = None
         if isinstance(score_val, (int, float)):
             score_num = float(score_val)
         
-        from html import escape as _escape
         if status == 'completed':
-            status_html = f"✅ Completed\nID: {_escape(submission_id)}\nScore: {score_num:.2f}" if score_num is not None else f"✅ Completed\nID: {_escape(submission_id)}"
+            status_html = f"✅ Completed\nID: {html.escape(submission_id)}\nScore: {score_num:.2f}" if score_num is not None else f"✅ Completed\nID: {html.escape(submission_id)}"
             score_text = f"{score_num:.2f}" if score_num is not None else "N/A"
             return status_html, score_text
-        elif status == 'processing':
-            return f"⚙️ Currently evaluating\nID: {_escape(submission_id)}", "In progress"
-        elif status == 'pending':
-            return f"⏳ Queued for evaluation\nID: {_escape(submission_id)}", "In progress"
+        elif status in _STATUS_STATIC:
+            emoji, label = _STATUS_STATIC[status]
+            return f"{emoji} {label}\nID: {html.escape(submission_id)}", "In progress"
         elif status == 'failed':
             err = str(result.get('error', 'Unknown error'))
             status_html = f"""
 <div class='status-box'>
   <div>❌ Failed</div>
-  <div><b>ID:</b> <code>{_escape(submission_id)}</code></div>
+  <div><b>ID:</b> <code>{html.escape(submission_id)}</code></div>
   <div style='margin-top:8px'><b>Error:</b></div>
-  <pre style='white-space:pre-wrap; background:#111; color:#eee; padding:8px; border-radius:4px'>{_escape(err)}</pre>
+  <pre style='white-space:pre-wrap; background:#111; color:#eee; padding:8px; border-radius:4px'>{html.escape(err)}</pre>
 </div>
 """
             return status_html, "Failed"
         else:
-            return f"❓ Unknown status\nID: {_escape(submission_id)}", "Unknown"
+            return f"❓ Unknown status\nID: {html.escape(submission_id)}", "Unknown"
     except Exception as e:
         return f"❌ Error: {str(e)}", None
 
-with gr.Blocks(title="SimpleRL Leaderboard", css="""
-.status-box {
-  font-size: 1rem;
-  background: linear-gradient(180deg, rgba(32,59,49,.5), rgba(17,32,27,.5));
-  border: 1px solid #1a3d30;
-  border-radius: 12px;
-  padding: 16px 18px;
-  color: #e8f5ef;
-  box-shadow: 0 8px 24px rgba(0,0,0,.25), inset 0 1px 0 rgba(255,255,255,.05);
-}
-.status-box.success {
-  border-color: rgba(43,217,138,.4);
-  background: linear-gradient(180deg, rgba(19,54,41,.7), rgba(10,26,20,.7));
-}
-.status-header {
-  display: flex; align-items: center; gap: 10px; margin-bottom: 6px; font-weight: 600;
-}
-.status-pill {
-  background: rgba(43,217,138,.12);
-  color: #2bd98a;
-  border: 1px solid rgba(43,217,138,.35);
-  padding: 2px 8px; border-radius: 999px; font-size: .85em;
-}
-.status-id { display: flex; align-items: center; gap: 8px; margin: 8px 0 12px 0; }
-.status-id code {
-  font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, \"Liberation Mono\", \"Courier New\", monospace;
-  background: rgba(0,0,0,.35);
-  padding: 6px 8px; border-radius: 6px; border: 1px solid rgba(255,255,255,.06);
-}
-.copy-btn {
-  background: rgba(43,217,138,.15); color: #2bd98a; border: 1px solid rgba(43,217,138,.3);
-  border-radius: 6px; padding: 6px 8px; cursor: pointer;
-}
-.copy-btn:hover { background: rgba(43,217,138,.25); }
-.status-kv { display: grid; grid-template-columns: 120px 1fr; row-gap: 6px; column-gap: 10px; margin-bottom: 4px; }
-.status-kv .label { color: #9ecfb6; }
-.status-kv .value { color: #e8f5ef; font-weight: 500; }
-.status-foot { margin-top: 10px; color: #9ecfb6; font-size: .95em; }
-.status-box pre { white-space: pre-wrap; background: #111; color: #eee; padding: 8px; border-radius: 6px; border: 1px solid rgba(255,255,255,.06); }
-/* Cute GitHub button (top-right) */
-.gh-btn {
-  position: fixed; top: 12px; right: 12px; z-index: 9999;
-  display: inline-flex; align-items: center; gap: 8px;
-  padding: 8px 12px; border-radius: 999px;
-  background: linear-gradient(180deg, #24292e, #1f2328);
-  border: 1px solid rgba(255,255,255,.08);
-  box-shadow: 0 8px 20px rgba(0,0,0,.35), inset 0 1px 0 rgba(255,255,255,.06);
-  color: #fff; text-decoration: none; font-weight: 600;
-}
-.gh-btn:hover { filter: brightness(1.08); transform: translateY(-1px); }
-.gh-btn:active { transform: translateY(0); }
-.gh-ico { font-size: 1.1rem; line-height: 1; }
-.gh-text { font-size: .95rem; }
-@media (max-width: 520px) { .gh-text { display: none; } }
-""") as demo:
+# All page CSS lives in one static file, read once at import
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "leaderboard.css")) as _css_file:
+    _CSS = _css_file.read()
+
+with gr.Blocks(title="SimpleRL Leaderboard", css=_CSS) as demo:
     gr.Markdown("# 🏆 SimpleRL Leaderboard")
     # Inject SEO meta tags into <head>
     gr.HTML(
@@ -376,10 +489,13 @@ with gr.Blocks(title="SimpleRL Leaderboard", css="""
             env_selector = gr.Dropdown(
                 label="Environment", 
                 choices=[], 
-                value=None
+                value=None,
+                elem_id="env-selector"
             )
             envs_refresh_btn = gr.Button("Refresh Envs", elem_id="refresh-envs-btn")
-            leaderboard_btn = gr.Button("Refresh Leaderboard", variant="primary")
+            leaderboard_btn = gr.Button("Refresh Leaderboard", variant="primary", elem_id="refresh-lb-btn")
+            # Clicked only by the polling fallback (no EventSource or stream down); may serve stale
+            timer_refresh_btn = gr.Button("Refresh", elem_id="timer-refresh-lb-btn", elem_classes=["hidden-trigger"])
 
         with gr.Accordion("Filters", open=False):
             with gr.Row():
@@ -396,28 +512,55 @@ with gr.Blocks(title="SimpleRL Leaderboard", css="""
                 )
             # Date filters removed per request
 
-        leaderboard = gr.Dataframe(
-            headers=["Rank", "Submission ID", "User", "Score", "Algorithm", "Date (in UTC)"],
-            datatype=["str", "str", "str", "number", "str", "str"],
-            col_count=(6, "fixed"),
-            elem_id="leaderboard-table"
-        )
+        leaderboard = gr.HTML(value=_render_leaderboard([]), elem_id="leaderboard-table")
 
         # Quick range removed per request
 
+        load_more_btn = gr.Button("Load more")
+        lb_limit = gr.State(_LB_PAGE_SIZE)
+        lb_inputs = [env_selector, id_filter, user_filter, algorithm_filter, score_min, score_max, sort_order, lb_limit]
+
         leaderboard_btn.click(
+            fn=refresh_leaderboard,
+            inputs=lb_inputs,
+            outputs=leaderboard
+        )
+        timer_refresh_btn.click(
+            fn=get_leaderboard,
+            inputs=lb_inputs,
+            outputs=leaderboard
+        )
+        load_more_btn.click(
+            fn=lambda n: min(int(n or _LB_PAGE_SIZE) + _LB_PAGE_SIZE, _LB_MAX_ROWS),
+            inputs=lb_limit,
+            outputs=lb_limit
+        ).then(
+            fn=get_leaderboard,
+            inputs=lb_inputs,
+            outputs=leaderboard
+        )
+        # A different env starts again from the first page
+        env_selector.change(
+            fn=lambda: _LB_PAGE_SIZE,
+            inputs=None,
+            outputs=lb_limit
+        ).then(
             fn=get_leaderboard,
-            inputs=[env_selector, id_filter, user_filter, algorithm_filter, score_min, score_max, sort_order],
+            inputs=lb_inputs,
             outputs=leaderboard
         )
 
         # Fetch environments from backend endpoint
-        def fetch_envs():
+        def fetch_envs(force=False):
+            cached = _ENVS_CACHE["v"]
+            if cached and not force and time.monotonic() - _ENVS_CACHE["t"] < _ENVS_CACHE_TTL_SECONDS:
+                return gr.update(choices=cached, value=cached[0])
             try:
-                res = requests.get(f"{API_URL}/api/leaderboard/environments")
+                res = SESSION.get(f"{API_URL}/api/leaderboard/environments", timeout=_TIMEOUT)
                 if res.status_code == 200:
                     envs = res.json().get("envs", [])
                     if envs:
+                        _ENVS_CACHE["t"], _ENVS_CACHE["v"] = time.monotonic(), envs
                         return gr.update(choices=envs, value=envs[0])
                     else:
                         logger.error("Environments endpoint returned empty list")
@@ -435,32 +578,12 @@ with gr.Blocks(title="SimpleRL Leaderboard", css="""
             upd = fetch_envs()
             return upd, upd
 
-        envs_refresh_btn.click(fn=fetch_envs, inputs=None, outputs=env_selector)
-        env_reload_btn.click(fn=fetch_envs, inputs=None, outputs=env_dropdown)
+        # Explicit refresh clicks bypass the cache
+        envs_refresh_btn.click(fn=lambda: fetch_envs(force=True), inputs=None, outputs=env_selector)
+        env_reload_btn.click(fn=lambda: fetch_envs(force=True), inputs=None, outputs=env_dropdown)
 
-        # Inject JS for auto-refresh every 30 seconds and default to Leaderboard
+        # Inject JS for push-driven leaderboard refresh and default to Leaderboard (CSS is in static/leaderboard.css)
         gr.HTML("""
-        <style>
-        #leaderboard-table table { font-size: 0.95rem; }
-        #leaderboard-table thead th { position: sticky; top: 0; background: #161616; color: #f3f3f3; }
-        #leaderboard-table td:nth-child(4) { text-align: right; font-variant-numeric: tabular-nums; }
-        #leaderboard-table td, #leaderboard-table th { padding: 8px 12px; }
-        /* Make Refresh Envs button align and size similarly to primary button */
-        #refresh-envs-btn button, #refresh-envs-btn {
-          padding: 8px 12px !important;
-          height: 40px !important;
-          line-height: 24px !important;
-          margin-left: 8px !important;
-        }
-        /* Orange accent for Submit button */
-        #submit-eval-btn button, #submit-eval-btn { 
-          background: linear-gradient(180deg, #ff8c1a, #e67600) !important; 
-          border: 1px solid #cc6a00 !important; color: #1b1b1b !important; 
-        }
-        #submit-eval-btn:hover button, #submit-eval-btn:hover { 
-          background: linear-gradient(180deg, #ffa64d, #ff8c1a) !important; 
-        }
-        </style>
         <script>
         (function(){
           const API = (window.API_URL || '%s');
@@ -490,20 +613,84 @@ with gr.Blocks(title="SimpleRL Leaderboard", css="""
           }
           window.addEventListener('load', ensureVisitorToken);
         })();
-        setInterval(function() {
-            const btn = Array.from(document.querySelectorAll("button"))
-                .find(b => b.innerText.includes("Refresh Leaderboard"));
+        const refreshBtns = {};
+        function clickButton(id) {
+            // Re-resolve only if Gradio re-rendered and detached the cached node
+            let btn = refreshBtns[id];
+            if (!btn || !btn.isConnected) {
+                const el = document.getElementById(id);
+                btn = refreshBtns[id] = el && (el.tagName === 'BUTTON' ? el : el.querySelector('button'));
+            }
             if (btn) { btn.click(); }
-        }, 30000);
+        }
+        // Push-driven: bypasses the frontend cache's fresh/stale windows
+        function refreshLeaderboard() { clickButton('refresh-lb-btn'); }
+        // Refresh only when the API announces a change for the selected env.
+        // Hidden tabs just mark themselves stale and catch up once visible.
+        let staleWhileHidden = false;
+        // Bursts of change events (e.g. a batch of evaluations finishing)
+        // collapse into one refresh 500ms after the last one
+        let refreshTimer = null;
+        function onLeaderboardChanged() {
+            if (document.visibilityState !== 'visible') { staleWhileHidden = true; return; }
+            clearTimeout(refreshTimer);
+            refreshTimer = setTimeout(function() {
+                (window.requestIdleCallback || setTimeout)(refreshLeaderboard);
+            }, 500);
+        }
+        // Timer-driven polling is allowed to be served stale. Used when there is
+        // no EventSource, and while the stream is erroring (until it reopens)
+        let pollTimer = null;
+        function startPolling() {
+            if (pollTimer) { return; }
+            pollTimer = setInterval(function() {
+                if (document.visibilityState === 'visible') { clickButton('timer-refresh-lb-btn'); }
+            }, 30000);
+        }
+        function stopPolling() {
+            clearInterval(pollTimer);
+            pollTimer = null;
+        }
+        if (window.EventSource) {
+            const STREAM_API = (window.API_URL || '%s');
+            let es = null, streamEnv = null;
+            // The dropdown's value is set programmatically, so check it cheaply
+            // (no network) and reopen the stream when the env changes
+            setInterval(function() {
+                const input = document.querySelector('#env-selector input');
+                const env = input && input.value;
+                if (!env || env === streamEnv) { return; }
+                streamEnv = env;
+                if (es) { es.close(); }
+                es = new EventSource(STREAM_API + '/api/leaderboard/stream?env_id=' + encodeURIComponent(env));
+                es.onmessage = function(ev) { if (ev.data === 'changed') { onLeaderboardChanged(); } };
+                // The browser keeps retrying the stream; poll until it is back
+                es.onerror = startPolling;
+                es.onopen = stopPolling;
+            }, 2000);
+        } else {
+            startPolling();
+        }
+        document.addEventListener('visibilitychange', function() {
+            if (document.visibilityState === 'visible' && staleWhileHidden) {
+                staleWhileHidden = false;
+                refreshLeaderboard();
+            }
+        });
         window.addEventListener('load', function(){
           const tab = Array.from(document.querySelectorAll('[role="tab"], .tabitem')).find(el => (el.innerText||'').includes('Leaderboard'));
           if (tab) { try { tab.click(); } catch(e){} }
         });
         </script>
-        """ % (API_URL))
+        """ % (API_URL, API_URL))
 
-        # Populate environment dropdowns on load using backend discovery
-        demo.load(fn=fetch_envs_both, inputs=None, outputs=[env_selector, env_dropdown])
+        # Populate environment dropdowns on load using backend discovery, then
+        # render the selected env's leaderboard
+        demo.load(fn=fetch_envs_both, inputs=None, outputs=[env_selector, env_dropdown]).then(
+            fn=get_leaderboard,
+            inputs=lb_inputs,
+            outputs=leaderboard
+        )
     
     with gr.Tab("Check Status"):
         status_box_cs = gr.HTML(value="<div class='status-box'>Enter a submission ID and click Check.</div>")
@@ -519,9 +706,12 @@ with gr.Blocks(title="SimpleRL Leaderboard", css="""
         )
 
 if __name__ == "__main__":
+    # Handlers are I/O-bound (mostly async), so let many run at once
+    demo.queue(max_size=128, default_concurrency_limit=32, api_open=False)
     demo.launch(
         server_name="0.0.0.0",
         server_port=PORT,
         show_api=False,
-        debug=True
+        debug=True,
+        max_threads=64
     )
\ No newline at end of file
@@ -2,11 +2,46 @@
 """
 Script to manually generate test evaluation metrics for testing the Grafana dashboard
 """
+import io
+import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except Exception:  # optional; stdlib json works, just slower
+    orjson = None
+
+# One pooled keep-alive session for every API/Prometheus call
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def wait_all(ids, timeout=120):
+    """Poll /api/results until every submission is completed or failed"""
+    deadline = time.monotonic() + timeout
+    pending = set(ids)
+    delay = 0.5
+    while pending and time.monotonic() < deadline:
+        for sid in list(pending):
+            try:
+                response = SESSION.get(f'http://localhost:8000/api/results/{sid}', timeout=10)
+                if response.status_code == 200 and _json_loads(response.content).get('status') in ('completed', 'failed'):
+                    pending.discard(sid)
+            except Exception as e:
+                print(f"⚠️ Error polling {sid}: {e}")
+        if pending:
+            time.sleep(delay)
+            delay = min(5.0, delay * 1.5)
+    if pending:
+        print(f"⚠️ {len(pending)} submission(s) still running after {timeout}s")
+
 def generate_test_metrics():
     """Generate test evaluation metrics by making API calls"""
     
@@ -34,97 +69,66 @@ env.close()
 print(f'{{"score": {total_reward}}}')
 '''
     
-    # Write test script to file
-    with open('test_script.py', 'w') as f:
-        f.write(test_script)
-    
-    # Submit multiple test submissions to generate metrics
-    submissions = []
-    
-    for i in range(5):
+    # Submit multiple test submissions to generate metrics. The POSTs are
+    # pure network wait, so they go out concurrently from one in-memory copy
+    payload = test_script.encode()
+
+    def submit(i):
         try:
-            with open('test_script.py', 'rb') as f:
-                files = {'file': ('test_script.py', f, 'text/plain')}
-                data = {
+            response = SESSION.post(
+                'http://localhost:8000/api/submit',
+                files={'file': ('test_script.py', io.BytesIO(payload), 'text/plain')},
+                data={
                     'env_id': 'CartPole-v1',
                     'algorithm': f'TestMetrics{i}',
                     'name': f'test_user_{i}'
-                }
-                
-                response = requests.post(
-                    'http://localhost:8000/api/submit',
-                    files=files,
-                    data=data,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    submission_id = result['id']
-                    submissions.append(submission_id)
-                    print(f"✅ Submitted test {i+1}: {submission_id}")
-                else:
-                    print(f"❌ Failed to submit test {i+1}: {response.status_code}")
-                    
+                },
+                timeout=30
+            )
+            if response.status_code == 200:
+                submission_id = response.json()['id']
+                print(f"✅ Submitted test {i+1}: {submission_id}")
+                return submission_id
+            print(f"❌ Failed to submit test {i+1}: {response.status_code}")
         except Exception as e:
             print(f"❌ Error submitting test {i+1}: {e}")
-        
-        # Wait a bit between submissions
-        time.sleep(2)
+        return None
+
+    with ThreadPoolExecutor(max_workers=5) as ex:
+        submissions = [sid for sid in ex.map(submit, range(5)) if sid]
     
     print(f"\nSubmitted {len(submissions)} test submissions")
     print("Waiting for evaluations to complete...")
     
-    # Wait for evaluations to complete
-    time.sleep(60)
+    # Poll submission state and move on as soon as every run has finished
+    wait_all(submissions)
     
     # Check metrics
     print("\nChecking evaluation metrics...")
     
+    # One instant query for all three counters, grouped by metric name
+    sections = [
+        ("evaluation_started_total", "✅ Evaluation metrics available in Prometheus:", "❌ No evaluation metrics in Prometheus"),
+        ("evaluation_completed_total", "✅ Evaluation completed metrics:", "❌ No evaluation completed metrics"),
+        ("evaluation_failed_total", "✅ Evaluation failed metrics:", "❌ No evaluation failed metrics"),
+    ]
     try:
-        response = requests.get("http://localhost:9090/api/v1/query?query=evaluation_started_total", timeout=10)
+        response = SESSION.get(
+            "http://localhost:9090/api/v1/query",
+            params={"query": '{__name__=~"evaluation_(started|completed|failed)_total"}'},
+            timeout=10,
+        )
         if response.status_code == 200:
-            data = response.json()
-            if data.get('data', {}).get('result'):
-                print("✅ Evaluation metrics available in Prometheus:")
-                for result in data['data']['result']:
-                    print(f"   {result['metric']}: {result['value'][1]}")
-            else:
-                print("❌ No evaluation metrics in Prometheus")
-        else:
-            print(f"❌ Prometheus query failed: {response.status_code}")
-            
-    except Exception as e:
-        print(f"❌ Error querying Prometheus: {e}")
-    
-    # Check completed metrics
-    try:
-        response = requests.get("http://localhost:9090/api/v1/query?query=evaluation_completed_total", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('data', {}).get('result'):
-                print("✅ Evaluation completed metrics:")
-                for result in data['data']['result']:
-                    print(f"   {result['metric']}: {result['value'][1]}")
-            else:
-                print("❌ No evaluation completed metrics")
-        else:
-            print(f"❌ Prometheus query failed: {response.status_code}")
-            
-    except Exception as e:
-        print(f"❌ Error querying Prometheus: {e}")
-    
-    # Check failed metrics
-    try:
-        response = requests.get("http://localhost:9090/api/v1/query?query=evaluation_failed_total", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('data', {}).get('result'):
-                print("✅ Evaluation failed metrics:")
-                for result in data['data']['result']:
-                    print(f"   {result['metric']}: {result['value'][1]}")
-            else:
-                print("❌ No evaluation failed metrics")
+            by_name = defaultdict(list)
+            for result in _json_loads(response.content).get('data', {}).get('result', []):
+                by_name[result['metric'].get('__name__')].append(result)
+            for name, found_msg, missing_msg in sections:
+                if by_name.get(name):
+                    print(found_msg)
+                    for result in by_name[name]:
+                        print(f"   {result['metric']}: {result['value'][1]}")
+                else:
+                    print(missing_msg)
         else:
             print(f"❌ Prometheus query failed: {response.status_code}")
             
@@ -132,4 +136,7 @@ print(f'{{"score": {total_reward}}}')
         print(f"❌ Error querying Prometheus: {e}")
 
 if __name__ == "__main__":
-    generate_test_metrics()
+    try:
+        generate_test_metrics()
+    finally:
+        SESSION.close()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+One-shot schema setup: create all tables defined on the SQLAlchemy models.
+The API no longer does this on every boot (see RUN_CREATE_ALL); run it once
+per database, e.g. `DATABASE_URL=... python scripts/init_db.py`.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def main():
+    try:
+        from app.db.session import create_tables
+        create_tables()
+        print("✅ Database tables created")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to create tables: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
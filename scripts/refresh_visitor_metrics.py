@@ -1,23 +1,60 @@
 #!/usr/bin/env python3
 """
-Script to refresh visitor metrics manually using Docker.
+Script to refresh visitor metrics manually.
+Calls the API's internal refresh endpoint; falls back to docker exec if the API is unreachable.
 This can be used for testing or as a backup to the automatic refresh.
 """
 
+import os
 import subprocess
 import sys
 
+import requests
+
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+SESSION = requests.Session()
+
+
+def _refresh_via_docker():
+    """Refresh visitor metrics using docker exec (slow fallback)"""
+    result = subprocess.run([
+        'docker', 'exec', 'rl-eval-leaderboard-api-1',
+        'python', '-c',
+        'from app.api import visitor; visitor.refresh_unique_visitor_metrics(); print("Visitor metrics refreshed")'
+    ], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
 def refresh_visitor_metrics():
-    """Refresh visitor metrics using docker exec"""
+    """Refresh visitor metrics via the internal API endpoint"""
+    token = os.environ.get("INTERNAL_TOKEN", "")
     try:
-        result = subprocess.run([
-            'docker', 'exec', 'rl-eval-leaderboard-api-1', 
-            'python', '-c', 
-            'from app.api import visitor; visitor.refresh_unique_visitor_metrics(); print("Visitor metrics refreshed")'
-        ], capture_output=True, text=True, check=True)
+        output = None
+        if token:
+            try:
+                resp = SESSION.post(
+                    f"{API_URL}/api/internal/refresh-visitor-metrics",
+                    headers={"X-Internal-Token": token},
+                    timeout=10,
+                )
+            except requests.ConnectionError as e:
+                print(f"⚠️ API unreachable ({e}); falling back to docker exec")
+            else:
+                if resp.status_code in (401, 403):
+                    print(f"⚠️ API rejected the internal token ({resp.status_code}); falling back to docker exec")
+                else:
+                    resp.raise_for_status()
+                    output = "Visitor metrics refreshed"
+        else:
+            print("⚠️ INTERNAL_TOKEN not set; falling back to docker exec")
+        if output is None:
+            output = _refresh_via_docker()
         print("✅ Visitor metrics refreshed successfully")
-        print(result.stdout.strip())
+        print(output)
         return True
+    except requests.HTTPError as e:
+        print(f"❌ Failed to refresh visitor metrics: {e}")
+        return False
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to refresh visitor metrics: {e}")
         print(f"Error output: {e.stderr}")
@@ -28,4 +65,5 @@ def refresh_visitor_metrics():
 
 if __name__ == "__main__":
     success = refresh_visitor_metrics()
+    SESSION.close()
     sys.exit(0 if success else 1)
@@ -1,4 +1,7 @@
 #!/usr/bin/env python3
+import json
+import sys
+
 import gymnasium as gym
 import random
 
@@ -15,4 +18,5 @@ for _ in range(1000):
         break
 
 env.close()
-print(f'{{"score": {total_reward}}}')
+sys.stdout.write(json.dumps({"score": float(total_reward)}, separators=(",", ":")) + "\n")
+sys.stdout.flush()
@@ -9,18 +9,18 @@ import time
 def test_countdown_logic():
     """Test the countdown timer calculation logic"""
     
-    # Simulate a submission created 2 minutes ago
-    created_time = datetime.now(timezone.utc) - timedelta(minutes=2)
-    elapsed_seconds = int((datetime.now(timezone.utc) - created_time).total_seconds())
+    # Simulate a submission created 2 minutes ago (one clock read for all of it)
+    now = datetime.now(timezone.utc)
+    created_time = now - timedelta(minutes=2)
+    elapsed_seconds = int((now - created_time).total_seconds())
     
     print(f"Submission created: {created_time}")
-    print(f"Current time: {datetime.now(timezone.utc)}")
+    print(f"Current time: {now}")
     print(f"Elapsed seconds: {elapsed_seconds}")
     
     # Calculate remaining time (300s timeout)
     remaining_seconds = max(0, 300 - elapsed_seconds)
-    minutes = remaining_seconds // 60
-    seconds = remaining_seconds % 60
+    minutes, seconds = divmod(remaining_seconds, 60)
     
     print(f"Remaining time: {minutes:02d}:{seconds:02d}")
     
@@ -37,8 +37,7 @@ def test_countdown_logic():
     print("\nTesting different scenarios:")
     for desc, elapsed in scenarios:
         remaining = max(0, 300 - elapsed)
-        mins = remaining // 60
-        secs = remaining % 60
+        mins, secs = divmod(remaining, 60)
         status = "🟢 Normal" if remaining > 60 else "🟡 Warning" if remaining > 30 else "🔴 Danger"
         print(f"{desc:20} -> {mins:02d}:{secs:02d} {status}")
 
@@ -2,6 +2,9 @@
 """
 Simple test submission for CartPole-v1 to generate evaluation metrics
 """
+import json
+import sys
+
 import gymnasium as gym
 import numpy as np
 
@@ -22,7 +25,8 @@ def main():
     env.close()
     
     # Print final score in JSON format
-    print(f'{{"score": {total_reward}}}')
+    sys.stdout.write(json.dumps({"score": float(total_reward)}, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
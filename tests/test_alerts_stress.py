@@ -5,10 +5,21 @@ import tempfile
 import subprocess
 import shutil
 import importlib
+import functools
+import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except Exception:  # optional; stdlib json works, just slower
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 
 API_BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000")
@@ -17,6 +28,34 @@ PROM_BASE_URL = os.environ.get("PROM_BASE_URL", "http://localhost:9090")
 # Track temp dirs for cleanup
 _CREATED_TEMP_DIRS: list[Path] = []
 
+# Prometheus queries share one keep-alive session; identical queries within
+# _PROM_TTL seconds are answered from _PROM_CACHE
+_PROM_SESSION = requests.Session()
+_PROM_TTL = 2.0
+_PROM_CACHE: dict[str, tuple[float, dict]] = {}
+# Prepared (URL-encoded) GETs keyed by query; a wait loop reuses the same one
+_PROM_PREPARED: dict[str, requests.PreparedRequest] = {}
+
+
+def prom_query(query: str) -> dict:
+    now = time.monotonic()
+    ent = _PROM_CACHE.get(query)
+    if ent is not None and now - ent[0] < _PROM_TTL:
+        return ent[1]
+    req = _PROM_PREPARED.get(query)
+    if req is None:
+        req = _PROM_PREPARED[query] = _PROM_SESSION.prepare_request(
+            requests.Request("GET", f"{PROM_BASE_URL}/api/v1/query", params={"query": query})
+        )
+    resp = _PROM_SESSION.send(req, timeout=10)
+    resp.raise_for_status()
+    data = _json_loads(resp.content)
+    # Evict expired entries on insert so the cache stays bounded
+    for q in [q for q, (t, _) in _PROM_CACHE.items() if now - t >= _PROM_TTL]:
+        del _PROM_CACHE[q]
+    _PROM_CACHE[query] = (now, data)
+    return data
+
 
 def _run(cmd: list[str], cwd: str | None = None) -> subprocess.CompletedProcess:
     return subprocess.run(
@@ -28,16 +67,27 @@ def _run(cmd: list[str], cwd: str | None = None) -> subprocess.CompletedProcess:
     )
 
 
-def _compose_base_cmd() -> list[str]:
-    # Prefer docker compose (v2); fall back to docker-compose
+@functools.lru_cache(maxsize=1)
+def _compose_base_cmd() -> tuple[str, ...]:
+    # Prefer docker compose (v2); fall back to docker-compose. Probed once per session
     probe = _run(["docker", "compose", "version"])  # type: ignore[list-item]
     if probe.returncode == 0:
-        return ["docker", "compose"]
-    return ["docker-compose"]
+        return ("docker", "compose")
+    return ("docker-compose",)
 
 
 def compose_run(args: list[str]) -> subprocess.CompletedProcess:
-    return _run(_compose_base_cmd() + args)
+    return _run([*_compose_base_cmd(), *args])
+
+
+def prom_query_range(query: str, start: float, end: float, step: float) -> dict:
+    resp = _PROM_SESSION.get(
+        f"{PROM_BASE_URL}/api/v1/query_range",
+        params={"query": query, "start": start, "end": end, "step": step},
+        timeout=10,
+    )
+    resp.raise_for_status()
+    return _json_loads(resp.content)
 
 
 def wait_for_prom_alert(
@@ -46,44 +96,60 @@ def wait_for_prom_alert(
     timeout_seconds: int = 600,
     poll_seconds: int = 5,
 ) -> bool:
-    # Query Prometheus ALERTS series for the alert state
-    deadline = time.time() + timeout_seconds
+    # Query Prometheus ALERTS series for the alert state. The first 30s use
+    # instant queries to catch a just-fired alert; after that one query_range
+    # covers everything since we started waiting, so polls can back off
+    # (1s -> 2 -> 4 ... capped at 30s) without missing a short firing window.
+    started = time.time()
+    deadline = started + timeout_seconds
     query = f'ALERTS{{alertname="{alert_name}",alertstate="{state}"}}'
-    while time.time() < deadline:
+    delay = 1.0
+    while True:
+        now = time.time()
         try:
-            resp = requests.get(
-                f"{PROM_BASE_URL}/api/v1/query",
-                params={"query": query},
-                timeout=10,
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                result = data.get("data", {}).get("result", [])
-                if result:
-                    return True
-        except Exception:
-            pass
-        time.sleep(poll_seconds)
-    return False
-
-
-def submit_file(filepath: Path, env_id: str, algorithm: str, user_id: str) -> None:
-    with open(filepath, "rb") as f:
-        files = {"file": (filepath.name, f, "text/x-python")}
-        data = {
-            "env_id": env_id,
-            "algorithm": algorithm,
-            "user_id": user_id,
-        }
-        try:
-            requests.post(
-                f"{API_BASE_URL}/api/submit/",
-                files=files,
-                data=data,
-                timeout=10,
-            )
+            if now - started < 30:
+                result = prom_query(query).get("data", {}).get("result", [])
+            else:
+                result = prom_query_range(query, started, now, poll_seconds).get("data", {}).get("result", [])
+            if result:
+                return True
         except Exception:
             pass
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(30.0, delay * 2)
+
+
+@functools.lru_cache(maxsize=16)
+def _read_payload(path: str) -> bytes:
+    # Temp submissions are written once and never modified; read each only once
+    return Path(path).read_bytes()
+
+
+def submit_file(
+    filepath: Path,
+    env_id: str,
+    algorithm: str,
+    user_id: str,
+    session: requests.Session | None = None,
+) -> None:
+    files = {"file": (filepath.name, io.BytesIO(_read_payload(str(filepath))), "text/x-python")}
+    data = {
+        "env_id": env_id,
+        "algorithm": algorithm,
+        "user_id": user_id,
+    }
+    try:
+        (session or requests).post(
+            f"{API_BASE_URL}/api/submit/",
+            files=files,
+            data=data,
+            timeout=10,
+        )
+    except Exception:
+        pass
 
 
 def _write_temp_py(contents: str) -> Path:
@@ -251,9 +317,13 @@ def test_celery_queue_backlog_long():
     compose_run(["stop", "worker"])  # best-effort
     try:
         bad = _write_temp_py("import sys; sys.exit(1)\n")
-        for _ in range(200):
-            submit_file(bad, "CartPole-v1", "BacklogTest", "stress")
-            time.sleep(0.2)
+        # Submissions are pure I/O; fan them out over one pooled session
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=32) as ex:
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=32))
+            list(ex.map(
+                lambda _: submit_file(bad, "CartPole-v1", "BacklogTest", "stress", session=session),
+                range(200),
+            ))
         ok = wait_for_prom_alert("CeleryQueueBacklog", timeout_seconds=1800)
         assert ok, "CeleryQueueBacklog did not fire in time"
     finally:
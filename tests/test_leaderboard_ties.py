@@ -0,0 +1,73 @@
+import os
+import json
+import uuid
+
+import pytest
+
+redis = pytest.importorskip("redis")
+
+# The service module builds its SQLAlchemy engine at import; these tests only
+# touch Redis, so any URL the engine accepts will do
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+
+from app.services.leaderboard import (  # noqa: E402
+    RedisLeaderboard,
+    _leaderboard_key,
+    _response_cache_key,
+    _submission_key,
+)
+
+
+@pytest.fixture()
+def board():
+    lb = RedisLeaderboard()
+    try:
+        lb.redis_client.ping()
+    except Exception as e:
+        pytest.skip(f"Redis not reachable: {e}")
+    env_id = f"TiesTest-{uuid.uuid4().hex[:8]}"
+    ids: list[str] = []
+    yield lb, env_id, ids
+    lb.redis_client.unlink(
+        _leaderboard_key(env_id), _response_cache_key(env_id), *[_submission_key(i) for i in ids]
+    )
+
+
+def _seed(lb: RedisLeaderboard, env_id: str, ids: list[str], rows: list[tuple[str, float, float]]):
+    # rows: (submission_id, score, created_at_ts)
+    pipe = lb.redis_client.pipeline(transaction=False)
+    for sid, score, ts in rows:
+        ids.append(sid)
+        pipe.zadd(_leaderboard_key(env_id), {sid: score})
+        pipe.set(_submission_key(sid), json.dumps({
+            "user_id": "tester",
+            "algorithm": "test",
+            "score": score,
+            "created_at": f"2025-01-01T00:00:{int(ts):02d}",
+            "created_at_ts": ts,
+            "env_id": env_id,
+        }))
+    pipe.execute()
+
+
+def test_equal_scores_straddling_the_limit_keep_created_at_order(board):
+    lb, env_id, ids = board
+    # Five ties at 100 cross the limit=3 cut. REV returns ties reverse-lex by
+    # id (t4, t3, ...), so without the boundary over-fetch the page would hold
+    # the newest tied entries instead of the earliest ones
+    _seed(lb, env_id, ids, [("top", 200.0, 10.0)] + [(f"t{i}", 100.0, float(i)) for i in range(5)])
+
+    rows = lb.get_leaderboard(env_id, limit=3, version="ties-1")
+
+    assert [r["id"] for r in rows] == ["top", "t0", "t1"]
+    assert [r["rank"] for r in rows] == [1, 2, 3]
+
+
+def test_ties_entirely_inside_the_page_are_unchanged(board):
+    lb, env_id, ids = board
+    _seed(lb, env_id, ids, [("b", 50.0, 1.0), ("a", 50.0, 2.0), ("c", 10.0, 3.0), ("d", 5.0, 4.0)])
+
+    rows = lb.get_leaderboard(env_id, limit=3, version="ties-2")
+
+    assert [r["id"] for r in rows] == ["b", "a", "c"]